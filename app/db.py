@@ -1,33 +1,78 @@
 import os
 import sqlite3
+import threading
 import datetime as dt
 from typing import Dict, List, Optional, Tuple
 
 DB_PATH = os.getenv("DB_PATH", "/data/sentinel.db")
 
+# Applied once per connection. WAL lets the event loop and threadpool readers
+# proceed while a write is in flight; NORMAL sync is durable under WAL.
+_CONN_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+_local = threading.local()
+
 
 def db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """
+    Returns the calling thread's long-lived connection, opening it on first use.
+    Callers must not close it; commit (or use `with conn:`) after writes.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONN_PRAGMAS:
+            conn.execute(pragma)
+        _local.conn = conn
     return conn
 
 
-def _col_exists(conn: sqlite3.Connection, table: str, col: str) -> bool:
-    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    return any(r["name"] == col for r in rows)
+# Bump when _ISSUE_COLUMNS (or any other migration) changes; databases already
+# at this version skip the column checks entirely on startup.
+SCHEMA_VERSION = 1
+
+# Columns added to `issues` after the original CREATE TABLE
+_ISSUE_COLUMNS: List[Tuple[str, str]] = [
+    ("first_inbound_ts", "TEXT"),
+    ("last_inbound_ts", "TEXT"),
+    ("inbound_count", "INTEGER DEFAULT 0"),
+    ("outbound_count", "INTEGER DEFAULT 0"),
+    ("conversation_id", "TEXT"),
+    ("breach_notified_ts", "TEXT"),
+    ("contact_name", "TEXT"),
+]
 
 
 def _ensure_columns(conn: sqlite3.Connection, table: str, cols: List[tuple]) -> None:
+    existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()}
     for name, ddl in cols:
-        if not _col_exists(conn, table, name):
+        if name not in existing:
             conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
 
 
+def _migrate_issue_columns(conn: sqlite3.Connection) -> None:
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    _ensure_columns(conn, "issues", _ISSUE_COLUMNS)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
 def _ensure_indexes(conn: sqlite3.Connection) -> None:
     # Hot-path issue scans
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_issues_status_type_due ON issues(status, issue_type, due_ts)"
     )
+    # Manager list / escalations filter on status alone and order by due_ts
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_issues_status_due ON issues(status, due_ts)"
+    )
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_issues_conversation_status ON issues(conversation_id, status)"
     )
@@ -37,6 +82,10 @@ def _ensure_indexes(conn: sqlite3.Connection) -> None:
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_issues_contact_status ON issues(contact_id, status)"
     )
+    # "Resolved since last summary" range scan
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_issues_status_resolved ON issues(status, resolved_ts)"
+    )
     # Event retention / diagnostics scans
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_raw_events_source_received ON raw_events(source, received_ts)"
@@ -49,24 +98,8 @@ def _ensure_indexes(conn: sqlite3.Connection) -> None:
 def ensure_schema() -> None:
     conn = db()
 
-    # Existing column migrations on issues
-    cols = {r["name"] for r in conn.execute("PRAGMA table_info(issues)").fetchall()}
-
-    # Newer columns that may not exist on older DBs
-    if "contact_name" not in cols:
-        conn.execute("ALTER TABLE issues ADD COLUMN contact_name TEXT")
-
-    # Ensure v1 issue fields exist even if init_db didn't run on an older DB
-    for col, ddl in [
-        ("first_inbound_ts", "ALTER TABLE issues ADD COLUMN first_inbound_ts TEXT"),
-        ("last_inbound_ts", "ALTER TABLE issues ADD COLUMN last_inbound_ts TEXT"),
-        ("inbound_count", "ALTER TABLE issues ADD COLUMN inbound_count INTEGER DEFAULT 0"),
-        ("outbound_count", "ALTER TABLE issues ADD COLUMN outbound_count INTEGER DEFAULT 0"),
-        ("conversation_id", "ALTER TABLE issues ADD COLUMN conversation_id TEXT"),
-        ("breach_notified_ts", "ALTER TABLE issues ADD COLUMN breach_notified_ts TEXT"),
-    ]:
-        if col not in cols:
-            conn.execute(ddl)
+    # Ensure issue columns exist even if init_db didn't run on an older DB
+    _migrate_issue_columns(conn)
 
     # Conversation-level state for internal-initiated threads
     conn.execute(
@@ -96,7 +129,6 @@ def ensure_schema() -> None:
 
     _ensure_indexes(conn)
     conn.commit()
-    conn.close()
 
 
 def init_db() -> None:
@@ -131,19 +163,8 @@ def init_db() -> None:
     """
     )
 
-    # Sentinel v1 issue fields
-    _ensure_columns(
-        conn,
-        "issues",
-        [
-            ("first_inbound_ts", "TEXT"),
-            ("last_inbound_ts", "TEXT"),
-            ("inbound_count", "INTEGER DEFAULT 0"),
-            ("outbound_count", "INTEGER DEFAULT 0"),
-            ("conversation_id", "TEXT"),
-            ("breach_notified_ts", "TEXT"),
-        ],
-    )
+    # Sentinel v1 issue fields (+ later additions); no-op once user_version is current
+    _migrate_issue_columns(conn)
 
     cur.execute(
         """
@@ -192,7 +213,6 @@ def init_db() -> None:
 
     _ensure_indexes(conn)
     conn.commit()
-    conn.close()
 
 
 def purge_raw_events(retention_days: int, source: Optional[str] = None, dry_run: bool = True) -> Dict[str, int]:
@@ -216,9 +236,8 @@ def purge_raw_events(retention_days: int, source: Optional[str] = None, dry_run:
 
     deleted = 0
     if not dry_run and eligible > 0:
-        cur = conn.execute(f"DELETE FROM raw_events WHERE {where}", params)  # nosec B608
-        conn.commit()
+        with conn:
+            cur = conn.execute(f"DELETE FROM raw_events WHERE {where}", params)  # nosec B608
         deleted = int(cur.rowcount if cur.rowcount is not None else 0)
 
-    conn.close()
     return {"eligible": eligible, "deleted": deleted}
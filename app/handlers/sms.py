@@ -1,11 +1,20 @@
 import re
-from typing import Any, Dict, Optional, Set
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
 
 _ACK_EMOJI_RE = re.compile(
     r"^[\s\W_]*(?:👍|👌|✅|🙏|🙂|😀|😄|😊|🙌|🤝|🎉|🥰|😅|😂|😉)+[\s\W_]*$",
     re.UNICODE,
 )
 
+_NON_PHONE_CHARS_RE = re.compile(r"[^\d\+]")
+# ASCII fast path for _NON_PHONE_CHARS_RE (the regex stays for non-ASCII input)
+_ASCII_NON_PHONE_CHARS = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if not (chr(c).isdigit() or chr(c) == "+"))
+)
+_WS_RUN_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
 _ACK_PHRASES = {
     "thanks",
     "thank you",
@@ -55,121 +64,205 @@ _ACK_REACTION_PREFIXES = (
     "emphasized",
     "questioned",
 )
+# t == prefix or t.startswith(prefix + " "), for every prefix in one anchored match
+_ACK_REACTION_RE = re.compile(
+    r"(?:" + "|".join(re.escape(p) for p in _ACK_REACTION_PREFIXES) + r")(?: |\Z)"
+)
 
 
 def normalize_phone(p: Optional[str]) -> Optional[str]:
     if not p:
         return None
+    # Fast path: already E.164-shaped ("+" then digits) comes back unchanged.
+    if type(p) is str and p[0] == "+" and p[1:].isdecimal():
+        return p
     s = str(p).strip()
-    s = re.sub(r"[^\d\+]", "", s)
+    s = s.translate(_ASCII_NON_PHONE_CHARS) if s.isascii() else _NON_PHONE_CHARS_RE.sub("", s)
     if s.startswith("00"):
         s = "+" + s[2:]
-    if s and s[0] != "+" and len(re.sub(r"\D", "", s)) == 10:
-        s = "+1" + re.sub(r"\D", "", s)
+    if s and s[0] != "+":
+        digits = s.replace("+", "")  # only digits and "+" remain at this point
+        if len(digits) == 10:
+            s = "+1" + digits
     return s
 
 
-def extract_text(payload: Dict[str, Any]) -> str:
-    for k in ("body", "message", "text", "content", "Message"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
+# Candidate payload keys per field, in priority order. Each payload level is
+# scanned once and every key is routed to the field(s) it can satisfy.
+_FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "text": ("body", "message", "text", "content", "Message"),
+    "conversation_id": ("conversationId", "conversation_id", "conversation", "conversationID"),
+    "contact_id": ("contactId", "contact_id", "contact", "contactID"),
+    "from_phone": ("from", "fromNumber", "phone", "customerPhone"),
+    "direction": ("direction", "type"),
+    "contact_type": ("contactType", "contact_type", "type"),
+    "contact_name": ("contactName", "fullName", "full_name", "name"),
+}
 
-    for k in ("data", "sms", "message", "Message"):
-        v = payload.get(k)
-        if isinstance(v, dict):
-            t = extract_text(v)
-            if t:
-                return t
-    return ""
+# Nested id keys honoured when a conversation/contact key holds an object.
+_NESTED_ID_KEYS: Dict[str, Tuple[str, ...]] = {
+    "conversation_id": ("id", "conversationId"),
+    "contact_id": ("id",),
+}
 
+_FIELD_MAP: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+for _field, _keys in _FIELD_KEYS.items():
+    for _prio, _key in enumerate(_keys):
+        _FIELD_MAP[_key] = _FIELD_MAP.get(_key, ()) + ((_field, _prio),)
+del _field, _keys, _prio, _key
 
-def extract_conversation_id(payload: Dict[str, Any]) -> Optional[str]:
-    for k in ("conversationId", "conversation_id", "conversation", "conversationID"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-        if isinstance(v, dict):
-            for kk in ("id", "conversationId"):
-                vv = v.get(kk)
-                if isinstance(vv, str) and vv.strip():
-                    return vv.strip()
+# Canonical instances of the values callers compare against, so the common
+# cases hand back a shared constant instead of a fresh str per message.
+# Values are only deduplicated, never remapped ("in" stays "in").
+_DIRECTION_INTERN: Dict[str, str] = {s: s for s in ("inbound", "outbound", "outgoing")}
+_CONTACT_TYPE_INTERN: Dict[str, str] = {s: s for s in ("internal", "lead", "customer")}
+
+_TEXT_CONTAINERS = ("data", "sms", "message", "Message")
+# Fields that are looked up again in payload["data"] (recursively) when missing.
+_DATA_CHAIN_FIELDS = ("conversation_id", "contact_id", "from_phone", "direction")
+
+
+@dataclass(slots=True)
+class Extracted:
+    text: str = ""
+    conversation_id: Optional[str] = None
+    contact_id: Optional[str] = None
+    from_phone: Optional[str] = None
+    direction: str = ""
+    contact_type: Optional[str] = None
+    contact_name: Optional[str] = None
+
+
+def _scan_level(d: Dict[str, Any]) -> Dict[str, str]:
+    """Single pass over one payload level: best (lowest priority) value per field."""
+    best: Dict[str, Tuple[int, str]] = {}
+    for k, v in d.items():
+        routes = _FIELD_MAP.get(k)
+        if routes is None:
+            continue
+        # Parsed JSON/form values are exact str/dict, so `type() is` is enough.
+        # `v and not v.isspace()` == `v.strip()` being non-empty, without the copy.
+        tv = type(v)
+        if tv is str:
+            if not v or v.isspace():
+                continue
+            for field, prio in routes:
+                cur = best.get(field)
+                if cur is None or prio < cur[0]:
+                    best[field] = (prio, v)
+        elif tv is dict:
+            for field, prio in routes:
+                nested = _NESTED_ID_KEYS.get(field)
+                if nested is None:
+                    continue
+                cur = best.get(field)
+                if cur is not None and cur[0] < prio:
+                    continue
+                for kk in nested:
+                    vv = v.get(kk)
+                    if type(vv) is str and vv and not vv.isspace():
+                        best[field] = (prio, vv)
+                        break
+    return {field: val for field, (_prio, val) in best.items()}
+
+
+def extract_all(payload: Dict[str, Any]) -> Extracted:
+    scans: Dict[int, Dict[str, str]] = {}
+
+    def scan(d: Dict[str, Any]) -> Dict[str, str]:
+        sc = scans.get(id(d))
+        if sc is None:
+            sc = scans[id(d)] = _scan_level(d)
+        return sc
+
+    def find_text(d: Dict[str, Any]) -> str:
+        t = scan(d).get("text")
+        if t is not None:
+            return t.strip()
+        for k in _TEXT_CONTAINERS:
+            v = d.get(k)
+            if isinstance(v, dict):
+                t = find_text(v)
+                if t:
+                    return t
+        return ""
+
+    top = scan(payload)
+    found = {f: top[f] for f in _DATA_CHAIN_FIELDS if f in top}
     d = payload.get("data")
-    if isinstance(d, dict):
-        return extract_conversation_id(d)
-    return None
+    while len(found) < len(_DATA_CHAIN_FIELDS) and isinstance(d, dict):
+        for f, v in scan(d).items():
+            if f in _DATA_CHAIN_FIELDS and f not in found:
+                found[f] = v
+        d = d.get("data")
+
+    contact_type = top.get("contact_type")
+    if contact_type is None:
+        c = payload.get("contact") or payload.get("data")
+        if isinstance(c, dict):
+            contact_type = scan(c).get("contact_type")
+
+    contact_name = top.get("contact_name")
+    if contact_name is None:
+        for container_key in ("contact", "data"):
+            c = payload.get(container_key)
+            if isinstance(c, dict):
+                contact_name = scan(c).get("contact_name")
+                if contact_name is not None:
+                    break
+
+    conversation_id = found.get("conversation_id")
+    contact_id = found.get("contact_id")
+    from_phone = found.get("from_phone")
+    direction = found.get("direction")
+    if direction is not None:
+        direction = direction.strip().lower()
+        direction = _DIRECTION_INTERN.get(direction, direction)
+    if contact_type is not None:
+        contact_type = contact_type.strip().lower()
+        contact_type = _CONTACT_TYPE_INTERN.get(contact_type, contact_type)
+    return Extracted(
+        text=find_text(payload),
+        conversation_id=conversation_id.strip() if conversation_id is not None else None,
+        contact_id=contact_id.strip() if contact_id is not None else None,
+        from_phone=normalize_phone(from_phone) if from_phone is not None else None,
+        direction=direction if direction is not None else "",
+        contact_type=contact_type,
+        contact_name=contact_name.strip() if contact_name is not None else None,
+    )
+
+
+def extract_text(payload: Dict[str, Any]) -> str:
+    return extract_all(payload).text
+
+
+def extract_conversation_id(payload: Dict[str, Any]) -> Optional[str]:
+    return extract_all(payload).conversation_id
 
 
 def extract_contact_id(payload: Dict[str, Any]) -> Optional[str]:
-    for k in ("contactId", "contact_id", "contact", "contactID"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-        if isinstance(v, dict):
-            vv = v.get("id")
-            if isinstance(vv, str) and vv.strip():
-                return vv.strip()
-    d = payload.get("data")
-    if isinstance(d, dict):
-        return extract_contact_id(d)
-    return None
+    return extract_all(payload).contact_id
 
 
 def extract_from_phone(payload: Dict[str, Any]) -> Optional[str]:
-    for k in ("from", "fromNumber", "phone", "customerPhone"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return normalize_phone(v)
-    d = payload.get("data")
-    if isinstance(d, dict):
-        return extract_from_phone(d)
-    return None
+    return extract_all(payload).from_phone
 
 
 def extract_direction(payload: Dict[str, Any]) -> str:
-    for k in ("direction", "type"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip().lower()
-    d = payload.get("data")
-    if isinstance(d, dict):
-        return extract_direction(d)
-    return ""
+    return extract_all(payload).direction
 
 
 def extract_contact_type(payload: Dict[str, Any]) -> Optional[str]:
-    for k in ("contactType", "contact_type", "type"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip().lower()
-
-    d = payload.get("contact") or payload.get("data")
-    if isinstance(d, dict):
-        for k in ("contactType", "contact_type", "type"):
-            v = d.get(k)
-            if isinstance(v, str) and v.strip():
-                return v.strip().lower()
-    return None
+    return extract_all(payload).contact_type
 
 
 def extract_contact_name(payload: Dict[str, Any]) -> Optional[str]:
-    for k in ("contactName", "fullName", "full_name", "name"):
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-
-    for container_key in ("contact", "data"):
-        d = payload.get(container_key)
-        if isinstance(d, dict):
-            for k in ("contactName", "fullName", "full_name", "name"):
-                v = d.get(k)
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-    return None
+    return extract_all(payload).contact_name
 
 
 def is_internal_sender(contact_type: Optional[str], contact_id: Optional[str], internal_contact_ids: Set[str]) -> bool:
-    if contact_type and contact_type.lower() == "internal":
+    # contact_type comes from extract_all, which already strips and lowercases it
+    if contact_type == "internal":
         return True
     if contact_id and contact_id in internal_contact_ids:
         return True
@@ -178,10 +271,9 @@ def is_internal_sender(contact_type: Optional[str], contact_id: Optional[str], i
 
 def _normalize_text_for_match(s: str) -> str:
     t = (s or "").strip().lower()
-    t = re.sub(r"[\r\n\t]+", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
-    t2 = re.sub(r"[^\w\s]", "", t).strip()
-    return t2
+    # \s+ already covers \r\n\t, so one collapse pass does both old substitutions
+    t = _WS_RUN_RE.sub(" ", t).strip()
+    return _PUNCT_RE.sub("", t).strip()
 
 
 def is_ack_closeout(text: Optional[str], max_len: int = 80) -> bool:
@@ -217,7 +309,7 @@ def is_ack_closeout(text: Optional[str], max_len: int = 80) -> bool:
     )
     if has_gratitude and has_ack_intent:
         return True
-    if any(t == p or t.startswith(p + " ") for p in _ACK_REACTION_PREFIXES):
+    if _ACK_REACTION_RE.match(t):
         return True
     if t.startswith("fixed it") or t.endswith("fixed it"):
         return True
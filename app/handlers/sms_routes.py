@@ -1,25 +1,40 @@
-import json
+import asyncio
 import datetime as dt
+import re
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
 from fastapi import FastAPI, Request
+import orjson # type: ignore
 
 from handlers.sms import (
-    extract_contact_id,
-    extract_contact_name,
-    extract_contact_type,
-    extract_conversation_id,
-    extract_direction,
-    extract_from_phone,
-    extract_text,
+    extract_all,
     is_internal_sender,
     is_ack_closeout,
     normalize_phone,
 )
 
 
+_KNOWN_COMMANDS = frozenset(("list", "more", "open", "resolve", "spam", "note"))
+_ID_TOKEN_RE = re.compile(r"(?<!\S)#?(\d+)(?!\S)")
+
+
+def _parse_ids(tokens: List[str]) -> List[int]:
+    # Whole tokens only ("#12" or "12"); order kept, duplicates dropped.
+    return list(dict.fromkeys(int(m.group(1)) for m in _ID_TOKEN_RE.finditer(" ".join(tokens))))
+
+
+async def lookup_or_none(lookup: Optional[Awaitable[Optional[str]]]) -> Optional[str]:
+    """Awaits an optional GHL lookup; a failed lookup counts as not found."""
+    if lookup is None:
+        return None
+    try:
+        return await lookup
+    except Exception:
+        return None
+
+
 @dataclass
 class SMSRouteDeps:
     tz_name: str
@@ -48,20 +63,25 @@ class SMSRouteDeps:
     ai_inbound_should_suppress: Callable[[Optional[str]], Awaitable[Tuple[bool, Optional[Dict[str, Any]]]]]
     db: Callable[[], Any]
     ghl_get_contact_name: Callable[[Optional[str]], Awaitable[Optional[str]]]
-    list_open_issues: Callable[[int, int], Tuple[List[dict], int]]
-    set_issue_contact_name: Callable[[int, str], None]
+    list_open_issues: Callable[..., Tuple[List[dict], int]]
+    set_issue_contact_names: Callable[[List[Tuple[int, str]]], None]
     render_list_like_summary: Callable[[List[dict], int, int, int], str]
     get_issue_by_id: Callable[[int], Any]
     add_note: Callable[[int, str], bool]
     resolve_by_id: Callable[[int, str], int]
+    resolve_by_ids: Callable[[List[int], str], List[int]]
+    get_issue_phones: Callable[[List[int]], List[str]]
     resolve_target: Callable[[str], int]
     mark_spam: Callable[[str], None]
+    mark_spam_many: Callable[[Iterable[str]], None]
     resolve_by_phone: Callable[[str, str], int]
     ghl_conversation_link: Callable[[Optional[str]], Optional[str]]
 
 
 def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
-    manager_list_offsets: Dict[str, int] = {}
+    # manager contact id -> (offset shown to the manager, (due_ts, id) of the last row sent)
+    manager_list_cursors: Dict[str, Tuple[int, Optional[Tuple[str, int]]]] = {}
+    tz = ZoneInfo(deps.tz_name)
 
     def _parse_issue_id(token: str) -> Optional[int]:
         t = (token or "").strip()
@@ -69,6 +89,25 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
             t = t[1:]
         return int(t) if t.isdigit() else None
 
+    async def _backfill_contact_names(rows: List[dict]) -> None:
+        # One concurrent GHL lookup per distinct contact, then one batched UPDATE.
+        missing = [r for r in rows if not (r.get("contact_name") or "").strip() and r.get("contact_id")]
+        if not missing:
+            return
+        contact_ids = list(dict.fromkeys(r["contact_id"] for r in missing))
+        names = await asyncio.gather(*(lookup_or_none(deps.ghl_get_contact_name(cid)) for cid in contact_ids))
+        by_contact = {cid: name for cid, name in zip(contact_ids, names) if name}
+        updates: List[Tuple[int, str]] = []
+        for r in missing:
+            fetched = by_contact.get(r["contact_id"])
+            if fetched:
+                updates.append((r["id"], fetched))
+                r["contact_name"] = fetched
+        deps.set_issue_contact_names(updates)
+
+    # Manager commands keep their SQLite work synchronous on the loop thread's
+    # connection: they are rare, touch a handful of indexed rows, and running one
+    # command's statements on a single connection keeps its writes together.
     async def handle_command(
         text: str, command_contact_id: Optional[str], command_from_phone: Optional[str]
     ) -> Dict[str, Any]:
@@ -83,41 +122,21 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
 
         cmd = parts[0].strip().lower()
         args = parts[1:]
-        known = {"list", "more", "open", "resolve", "spam", "note"}
-        if cmd not in known:
+        if cmd not in _KNOWN_COMMANDS:
             return {"ok": False, "ignored": "not_a_command"}
 
-        def _parse_ids(tokens: List[str]) -> List[int]:
-            ids: List[int] = []
-            for t in tokens:
-                tt = t.strip()
-                if tt.startswith("#"):
-                    tt = tt[1:]
-                if tt.isdigit():
-                    ids.append(int(tt))
-            seen = set()
-            out: List[int] = []
-            for i in ids:
-                if i not in seen:
-                    out.append(i)
-                    seen.add(i)
-            return out
-
         if cmd == "list":
             if not command_contact_id:
                 return {"ok": False, "error": "Missing manager contact id"}
             limit = 5
             offset = 0
-            manager_list_offsets[command_contact_id] = offset
             rows, total = deps.list_open_issues(limit=limit, offset=offset)
+            manager_list_cursors[command_contact_id] = (
+                offset, (rows[-1]["due_ts"], rows[-1]["id"]) if rows else None
+            )
             if total == 0:
                 return {"ok": True, "cmd": "LIST", "text": "No OPEN issues."}
-            for r in rows:
-                if not (r.get("contact_name") or "").strip() and r.get("contact_id"):
-                    fetched = await deps.ghl_get_contact_name(r["contact_id"])
-                    if fetched:
-                        deps.set_issue_contact_name(r["id"], fetched)
-                        r["contact_name"] = fetched
+            await _backfill_contact_names(rows)
             body = deps.render_list_like_summary(rows, total_open=total, offset=offset, limit=limit)
             return {"ok": True, "cmd": "LIST", "text": body}
 
@@ -125,18 +144,14 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
             if not command_contact_id:
                 return {"ok": False, "error": "Missing manager contact id"}
             limit = 5
-            offset = manager_list_offsets.get(command_contact_id, 0) + limit
-            manager_list_offsets[command_contact_id] = offset
-            rows, total = deps.list_open_issues(limit=limit, offset=offset)
+            prev_offset, after = manager_list_cursors.get(command_contact_id, (0, None))
+            offset = prev_offset + limit
+            rows, total = deps.list_open_issues(limit=limit, offset=offset, after=after)
             if not rows:
-                manager_list_offsets[command_contact_id] = 0
+                manager_list_cursors[command_contact_id] = (0, None)
                 return {"ok": True, "cmd": "MORE", "text": "No more OPEN issues. Reply: List"}
-            for r in rows:
-                if not (r.get("contact_name") or "").strip() and r.get("contact_id"):
-                    fetched = await deps.ghl_get_contact_name(r["contact_id"])
-                    if fetched:
-                        deps.set_issue_contact_name(r["id"], fetched)
-                        r["contact_name"] = fetched
+            manager_list_cursors[command_contact_id] = (offset, (rows[-1]["due_ts"], rows[-1]["id"]))
+            await _backfill_contact_names(rows)
             body = deps.render_list_like_summary(rows, total_open=total, offset=offset, limit=limit)
             return {"ok": True, "cmd": "MORE", "text": body}
 
@@ -169,10 +184,7 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
                 return {"ok": False, "error": "Usage: Resolve <id...>  OR  Resolve <phone/contactId/name>"}
             ids = _parse_ids(args)
             if ids:
-                changed: List[int] = []
-                for iid in ids:
-                    if deps.resolve_by_id(iid, status="RESOLVED") > 0:
-                        changed.append(iid)
+                changed = deps.resolve_by_ids(ids, status="RESOLVED")
                 if changed:
                     return {
                         "ok": True,
@@ -196,16 +208,11 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
                 return {"ok": False, "error": "Usage: Spam <id...>  OR  Spam <phone>"}
             ids = _parse_ids(args)
             if ids:
-                marked: List[int] = []
-                for iid in ids:
-                    r = deps.get_issue_by_id(iid)
-                    if r and r["phone"]:
-                        try:
-                            deps.mark_spam(r["phone"])
-                        except Exception:
-                            pass
-                    if deps.resolve_by_id(iid, status="SPAM") > 0:
-                        marked.append(iid)
+                try:
+                    deps.mark_spam_many(deps.get_issue_phones(ids))
+                except Exception:
+                    pass
+                marked = deps.resolve_by_ids(ids, status="SPAM")
                 if marked:
                     return {
                         "ok": True,
@@ -229,19 +236,28 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
         payload = await deps.parse_request_payload(request)
         deps.log_raw_event("inbound_sms", payload)
 
-        text = extract_text(payload)
-        contact_id = extract_contact_id(payload)
-        from_phone = extract_from_phone(payload)
-        conversation_id = extract_conversation_id(payload)
-
-        contact_name = extract_contact_name(payload)
-        if not contact_name and contact_id:
-            try:
-                contact_name = await deps.ghl_get_contact_name(contact_id)
-            except Exception:
-                contact_name = None
-        direction = extract_direction(payload)
-        contact_type = extract_contact_type(payload)
+        fields = extract_all(payload)
+        text = fields.text
+        contact_id = fields.contact_id
+        from_phone = fields.from_phone
+        conversation_id = fields.conversation_id
+
+        contact_name = fields.contact_name
+        # Name and conversation lookups are independent; overlap them on the pooled client.
+        name_lookup = deps.ghl_get_contact_name(contact_id) if not contact_name and contact_id else None
+        conv_lookup = (
+            deps.ghl_find_conversation_id_for_contact(contact_id, from_phone) if not conversation_id else None
+        )
+        if name_lookup is not None or conv_lookup is not None:
+            fetched_name, fetched_conv = await asyncio.gather(
+                lookup_or_none(name_lookup), lookup_or_none(conv_lookup)
+            )
+            if name_lookup is not None:
+                contact_name = fetched_name
+            if conv_lookup is not None:
+                conversation_id = fetched_conv
+        direction = fields.direction
+        contact_type = fields.contact_type
         is_internal = is_internal_sender(contact_type, contact_id, deps.internal_contact_ids)
         who = deps.flow_who(contact_name, from_phone, contact_id)
 
@@ -249,12 +265,6 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
         created_ts = now_local.isoformat()
         due_ts = deps.add_business_hours(now_local, deps.sms_sla_hours).isoformat()
 
-        if not conversation_id:
-            try:
-                conversation_id = await deps.ghl_find_conversation_id_for_contact(contact_id, from_phone)
-            except Exception:
-                conversation_id = None
-
         if conversation_id and is_internal:
             deps.set_last_internal_outbound(conversation_id, created_ts, contact_id)
 
@@ -290,9 +300,9 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
                     last_dt = None
             if last_dt:
                 last_dt_local = (
-                    last_dt.astimezone(ZoneInfo(deps.tz_name))
+                    last_dt.astimezone(tz)
                     if last_dt.tzinfo
-                    else last_dt.replace(tzinfo=ZoneInfo(deps.tz_name))
+                    else last_dt.replace(tzinfo=tz)
                 )
                 if deps.ack_close_window_mode == "eod":
                     window_end = deps.business_day_end_for(last_dt_local)
@@ -336,63 +346,10 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
             return {"received": True, "ignored": "ai_inbound_suppress"}
 
         conn = deps.db()
-        row = None
-        if conversation_id:
-            row = conn.execute(
-                "SELECT * FROM issues WHERE status IN ('PENDING','OPEN') AND issue_type='SMS' AND conversation_id=? ORDER BY id DESC LIMIT 1",
-                (conversation_id,),
-            ).fetchone()
-        if row is None and from_phone:
+        with conn:
+            # Update the newest PENDING/OPEN SMS issue for this conversation (else phone) in
+            # one statement; meta is patched in SQL so it never round-trips through Python.
             row = conn.execute(
-                "SELECT * FROM issues WHERE status IN ('PENDING','OPEN') AND issue_type='SMS' AND phone=? ORDER BY id DESC LIMIT 1",
-                (from_phone,),
-            ).fetchone()
-
-        if row is None:
-            meta: Dict[str, Any] = {"last_text": text[:500], "source": "inbound_sms_webhook"}
-            if contact_name:
-                meta["contact_name"] = contact_name
-            cur = conn.execute(
-                """
-                INSERT INTO issues
-                  (issue_type, contact_id, phone, contact_name, created_ts, due_ts, status, meta,
-                   first_inbound_ts, last_inbound_ts, inbound_count, outbound_count, conversation_id)
-                VALUES
-                  ('SMS', ?, ?, ?, ?, ?, 'PENDING', ?, ?, ?, 1, 0, ?)
-            """,
-                (
-                    contact_id,
-                    from_phone,
-                    contact_name or None,
-                    created_ts,
-                    due_ts,
-                    json.dumps(meta),
-                    created_ts,
-                    created_ts,
-                    conversation_id,
-                ),
-            )
-            deps.flow_log(
-                "sms.issue_created",
-                issue_id=cur.lastrowid,
-                who=who,
-                contact_id=contact_id,
-                conversation_id=conversation_id,
-                status="PENDING",
-                due_ts=due_ts,
-            )
-        else:
-            meta = {}
-            try:
-                if row["meta"]:
-                    meta = json.loads(row["meta"])
-            except Exception:
-                meta = {}
-            meta["last_text"] = text[:500]
-            meta["updated_by"] = "inbound_sms_webhook"
-            if contact_name and not meta.get("contact_name"):
-                meta["contact_name"] = contact_name
-            conn.execute(
                 """
                 UPDATE issues
                 SET last_inbound_ts=?,
@@ -401,20 +358,80 @@ def register_sms_routes(app: FastAPI, deps: SMSRouteDeps) -> None:
                     phone=COALESCE(phone, ?),
                     conversation_id=COALESCE(conversation_id, ?),
                     contact_name=CASE WHEN (contact_name IS NULL OR contact_name='') THEN ? ELSE contact_name END,
-                    meta=?
-                WHERE id=?
+                    meta=json_set(
+                        CASE WHEN ? IS NOT NULL
+                              AND json_valid(meta)
+                              AND COALESCE(json_extract(meta, '$.contact_name'), '') IN ('', 0)
+                             THEN json_set(meta, '$.contact_name', ?)
+                             WHEN json_valid(meta) THEN meta
+                             WHEN ? IS NOT NULL THEN json_object('contact_name', ?)
+                             ELSE '{}' END,
+                        '$.last_text', ?,
+                        '$.updated_by', 'inbound_sms_webhook'
+                    )
+                WHERE id = COALESCE(
+                    (SELECT id FROM issues WHERE status IN ('PENDING','OPEN') AND issue_type='SMS' AND conversation_id=? ORDER BY id DESC LIMIT 1),
+                    (SELECT id FROM issues WHERE status IN ('PENDING','OPEN') AND issue_type='SMS' AND phone=? ORDER BY id DESC LIMIT 1)
+                )
+                RETURNING id, status
             """,
-                (created_ts, contact_id, from_phone, conversation_id, contact_name or None, json.dumps(meta), row["id"]),
-            )
-            deps.flow_log(
-                "sms.issue_updated",
-                issue_id=row["id"],
-                who=who,
-                contact_id=contact_id,
-                conversation_id=conversation_id,
-                status=row["status"],
-            )
+                (
+                    created_ts,
+                    contact_id,
+                    from_phone,
+                    conversation_id,
+                    contact_name or None,
+                    contact_name or None,
+                    contact_name or None,
+                    contact_name or None,
+                    contact_name or None,
+                    text[:500],
+                    conversation_id,
+                    from_phone,
+                ),
+            ).fetchone()
+
+            if row is None:
+                meta: Dict[str, Any] = {"last_text": text[:500], "source": "inbound_sms_webhook"}
+                if contact_name:
+                    meta["contact_name"] = contact_name
+                cur = conn.execute(
+                    """
+                    INSERT INTO issues
+                      (issue_type, contact_id, phone, contact_name, created_ts, due_ts, status, meta,
+                       first_inbound_ts, last_inbound_ts, inbound_count, outbound_count, conversation_id)
+                    VALUES
+                      ('SMS', ?, ?, ?, ?, ?, 'PENDING', ?, ?, ?, 1, 0, ?)
+                """,
+                    (
+                        contact_id,
+                        from_phone,
+                        contact_name or None,
+                        created_ts,
+                        due_ts,
+                        orjson.dumps(meta).decode(),
+                        created_ts,
+                        created_ts,
+                        conversation_id,
+                    ),
+                )
+                deps.flow_log(
+                    "sms.issue_created",
+                    issue_id=cur.lastrowid,
+                    who=who,
+                    contact_id=contact_id,
+                    conversation_id=conversation_id,
+                    status="PENDING",
+                    due_ts=due_ts,
+                )
+            else:
+                deps.flow_log(
+                    "sms.issue_updated",
+                    issue_id=row["id"],
+                    who=who,
+                    contact_id=contact_id,
+                    conversation_id=conversation_id,
+                    status=row["status"],
+                )
 
-        conn.commit()
-        conn.close()
         return {"received": True, "issue_created_or_updated": True}
@@ -1,36 +1,39 @@
 from fastapi import FastAPI, Request, HTTPException # type: ignore
-import os, json, sqlite3, datetime as dt
-from typing import Any, Dict, Optional, List, Tuple
+from fastapi.responses import ORJSONResponse # type: ignore
+from starlette.formparsers import MultiPartParser # type: ignore
+import os, json, sqlite3, asyncio, threading, time, datetime as dt
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, List, Set, Tuple
 import httpx # type: ignore
+import orjson # type: ignore
+import random
 import re
+from urllib.parse import parse_qsl
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from db import db, init_db, ensure_schema, purge_raw_events
 from handlers.sms import (
     normalize_phone as _normalize_phone,
-    extract_text as _extract_text,
-    extract_conversation_id as _extract_conversation_id,
-    extract_contact_id as _extract_contact_id,
-    extract_from_phone as _extract_from_phone,
-    extract_direction as _extract_direction,
-    extract_contact_type as _extract_contact_type,
-    extract_contact_name as _extract_contact_name,
+    extract_all as _extract_all,
     is_internal_sender as _sms_is_internal_sender,
     is_ack_closeout as _sms_is_ack_closeout,
 )
-from handlers.sms_routes import SMSRouteDeps, register_sms_routes
+from handlers.sms_routes import SMSRouteDeps, lookup_or_none, register_sms_routes
 
 # ==========================
 # Config
 # ==========================
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
 TZ_NAME = os.getenv("TIMEZONE", os.getenv("TZ", "America/Chicago"))
+_TZ = ZoneInfo(TZ_NAME)
 
 GHL_APP_BASE = os.getenv("GHL_APP_BASE", "https://app.gohighlevel.com")
 GHL_LOCATION_ID = os.getenv("GHL_LOCATION_ID", "")
 
+_HHMM_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+
 def _parse_hhmm(value: str, fallback_hour: int, fallback_minute: int) -> Tuple[int, int]:
     s = (value or "").strip()
-    m = re.match(r"^(\d{1,2}):(\d{2})$", s)
+    m = _HHMM_RE.match(s)
     if not m:
         return fallback_hour, fallback_minute
     h = int(m.group(1))
@@ -46,9 +49,12 @@ _bh_end_total = (_bh_end_h * 60) + _bh_end_m
 if _bh_end_total <= _bh_start_total:
     _bh_start_h, _bh_start_m = 8, 0
     _bh_end_h, _bh_end_m = 17, 0
+    _bh_start_total = (_bh_start_h * 60) + _bh_start_m
+    _bh_end_total = (_bh_end_h * 60) + _bh_end_m
+_bh_day_seconds = (_bh_end_total - _bh_start_total) * 60
 
 # GoHighLevel / LeadConnector API
-GHL_BASE_URL = os.getenv("GHL_BASE_URL", "https://services.leadconnectorhq.com")
+GHL_BASE_URL = os.getenv("GHL_BASE_URL", "https://services.leadconnectorhq.com").rstrip("/")
 GHL_TOKEN = os.getenv("GHL_TOKEN", "")  # Private Integration token (Bearer)
 GHL_VERSION = os.getenv("GHL_VERSION", "2021-07-28")
 # OpenAI (AI follow-up gate; optional)
@@ -70,12 +76,14 @@ DECISION_MODE = os.getenv("DECISION_MODE", "deterministic").strip().lower()
 AI_PRIMARY_SUPPRESS_NO_CONFIDENCE = float(os.getenv("AI_PRIMARY_SUPPRESS_NO_CONFIDENCE", "0.65"))
 
 # Summary recipients (managers only, v1)
-MANAGER_CONTACT_IDS = [
+# Ordered (deduped) for sending; frozenset for membership checks.
+MANAGER_CONTACT_IDS_ORDERED: Tuple[str, ...] = tuple(dict.fromkeys(
     s.strip() for s in (os.getenv("MANAGER_CONTACT_IDS", "")).split(",") if s.strip()
-]
+))
+MANAGER_CONTACT_IDS: frozenset = frozenset(MANAGER_CONTACT_IDS_ORDERED)
 
 # Internal manager contact whitelist and reply grace window
-INTERNAL_CONTACT_IDS = set(
+INTERNAL_CONTACT_IDS: frozenset = frozenset(
     x.strip()
     for x in (os.getenv("INTERNAL_CONTACT_IDS", "")).split(",")
     if x.strip()
@@ -91,9 +99,12 @@ ACK_CLOSE_IGNORE_WINDOW_FOR_PURE_ACK = os.getenv("ACK_CLOSE_IGNORE_WINDOW_FOR_PU
 
 # Limits to keep SMS short and low-noise
 SUMMARY_MAX_ITEMS_PER_SECTION = int(os.getenv("SUMMARY_MAX_ITEMS_PER_SECTION", "8"))
+# How long send_summary waits for its pre-pass resolver before rendering anyway
+SUMMARY_RESOLVER_WAIT_SECONDS = float(os.getenv("SUMMARY_RESOLVER_WAIT_SECONDS", "10"))
 RESOLVED_SINCE_MAX_ITEMS = 5
 FLOW_LOG_ENABLED = os.getenv("FLOW_LOG_ENABLED", "1").lower() in ("1", "true", "yes", "on")
 RAW_EVENTS_RETENTION_DAYS = int(os.getenv("RAW_EVENTS_RETENTION_DAYS", "30"))
+MAX_WEBHOOK_BODY_BYTES = int(os.getenv("MAX_WEBHOOK_BODY_BYTES", str(1024 * 1024)))
 
 # SLA for customer SMS and CALL response before it is considered an issue (hours)
 SMS_SLA_HOURS = float(os.getenv("SMS_SLA_HOURS", "2"))
@@ -105,25 +116,23 @@ CALL_MISSED_MARKER_KEYS = [
     s.strip() for s in os.getenv("CALL_MISSED_MARKER_KEYS", "sentinel_missed_call,missed_call,is_missed_call").split(",") if s.strip()
 ]
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
-def set_last_internal_outbound(
-    conversation_id: str, ts_iso: str, internal_contact_id: Optional[str]
-) -> None:
-    conn = db()
-    conn.execute(
-        """
+_LAST_INTERNAL_OUTBOUND_UPSERT = """
       INSERT INTO conversation_state (conversation_id, last_internal_outbound_ts, last_internal_outbound_contact_id)
       VALUES (?, ?, ?)
       ON CONFLICT(conversation_id) DO UPDATE SET
         last_internal_outbound_ts=excluded.last_internal_outbound_ts,
         last_internal_outbound_contact_id=excluded.last_internal_outbound_contact_id
-    """,
-        (conversation_id, ts_iso, internal_contact_id),
-    )
-    conn.commit()
-    conn.close()
+    """
+
+def set_last_internal_outbound(
+    conversation_id: str, ts_iso: str, internal_contact_id: Optional[str]
+) -> None:
+    conn = db()
+    with conn:
+        conn.execute(_LAST_INTERNAL_OUTBOUND_UPSERT, (conversation_id, ts_iso, internal_contact_id))
 
 
 def get_last_internal_outbound(conversation_id: str) -> Optional[str]:
@@ -134,7 +143,6 @@ def get_last_internal_outbound(conversation_id: str) -> Optional[str]:
     """,
         (conversation_id,),
     ).fetchone()
-    conn.close()
     return row["last_internal_outbound_ts"] if row else None
 # ==========================
 # Ack close-out helpers
@@ -154,9 +162,9 @@ def _business_day_end_for(ts_local: dt.datetime) -> dt.datetime:
     If ts_local is after today's business end, returns next business day's end.
     """
     if ts_local.tzinfo is None:
-        ts_local = ts_local.replace(tzinfo=ZoneInfo(TZ_NAME))
+        ts_local = ts_local.replace(tzinfo=_TZ)
     # normalize to local tz
-    ts_local = ts_local.astimezone(ZoneInfo(TZ_NAME))
+    ts_local = ts_local.astimezone(_TZ)
     end_today = ts_local.replace(hour=_bh_end_h, minute=_bh_end_m, second=0, microsecond=0)
     base_day = ts_local
     if ts_local > end_today:
@@ -167,10 +175,24 @@ def _business_day_end_for(ts_local: dt.datetime) -> dt.datetime:
 
 
 @app.on_event("startup")
-def _startup():
+async def _startup():
     os.makedirs("/data", exist_ok=True)
     init_db()
     ensure_schema()
+    _load_spam_phones()
+    _ghl_http()
+    _start_raw_event_writer()
+
+@app.on_event("shutdown")
+async def _shutdown():
+    global _ghl_client, _ai_client
+    await _stop_raw_event_writer()
+    if _ghl_client is not None:
+        await _ghl_client.aclose()
+        _ghl_client = None
+    if _ai_client is not None:
+        await _ai_client.aclose()
+        _ai_client = None
 
 @app.get("/health")
 def health():
@@ -190,7 +212,25 @@ def _auth_or_401(request: Request) -> None:
 # Time / SLA helpers
 # ==========================
 def _now_local() -> dt.datetime:
-    return dt.datetime.now(tz=ZoneInfo(TZ_NAME))
+    return dt.datetime.now(_TZ)
+
+def _now_iso() -> str:
+    # C isoformat() beats an f-string rebuild, and the offset must track DST.
+    return dt.datetime.now(_TZ).isoformat()
+
+# raw_events.received_ts only needs ~1ms resolution; bursts of webhooks share
+# one formatted string instead of building a datetime per event.
+_RAW_TS_CACHE: Tuple[int, str] = (0, "")
+
+def _utc_now_iso_coarse() -> str:
+    global _RAW_TS_CACHE
+    now_ns = time.time_ns()
+    cached_ns, cached = _RAW_TS_CACHE
+    if now_ns - cached_ns < 1_000_000 and cached:
+        return cached
+    cached = dt.datetime.utcfromtimestamp(now_ns / 1e9).isoformat()
+    _RAW_TS_CACHE = (now_ns, cached)
+    return cached
 
 
 def _parse_iso_dt(value) -> Optional[dt.datetime]:
@@ -234,23 +274,20 @@ def _is_business_time(ts: dt.datetime) -> bool:
     return start <= ts <= end
 
 def _roll_to_next_business_open(ts: dt.datetime) -> dt.datetime:
-    cur = ts
-    while True:
-        if cur.weekday() >= 5:
-            days_ahead = 7 - cur.weekday()
-            cur = (cur + dt.timedelta(days=days_ahead)).replace(
-                hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0
-            )
-            continue
-        cur_mins = (cur.hour * 60) + cur.minute
+    wd = ts.weekday()
+    if wd < 5:
+        cur_mins = (ts.hour * 60) + ts.minute
         if cur_mins < _bh_start_total:
-            return cur.replace(hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0)
-        if cur_mins >= _bh_end_total:
-            cur = (cur + dt.timedelta(days=1)).replace(
-                hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0
-            )
-            continue
-        return cur
+            return ts.replace(hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0)
+        if cur_mins < _bh_end_total:
+            return ts
+        # after close: next weekday's open (Friday rolls to Monday)
+        days_ahead = 3 if wd == 4 else 1
+    else:
+        days_ahead = 7 - wd
+    return (ts + dt.timedelta(days=days_ahead)).replace(
+        hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0
+    )
 
 def add_business_hours(start_local: dt.datetime, hours: float) -> dt.datetime:
     """
@@ -258,33 +295,45 @@ def add_business_hours(start_local: dt.datetime, hours: float) -> dt.datetime:
     Adds hours strictly across business windows.
     """
     if start_local.tzinfo is None:
-        start_local = start_local.replace(tzinfo=ZoneInfo(TZ_NAME))
+        start_local = start_local.replace(tzinfo=_TZ)
 
     remaining = hours * 3600.0
     cur = _roll_to_next_business_open(start_local)
+    if remaining <= 0:
+        return cur
 
-    while remaining > 0:
-        day_end = cur.replace(hour=_bh_end_h, minute=_bh_end_m, second=0, microsecond=0)
-        available = (day_end - cur).total_seconds()
-        if remaining <= available:
-            return cur + dt.timedelta(seconds=remaining)
+    day_end = cur.replace(hour=_bh_end_h, minute=_bh_end_m, second=0, microsecond=0)
+    available = (day_end - cur).total_seconds()
+    if remaining <= available:
+        return cur + dt.timedelta(seconds=remaining)
+
+    # Spill into later business days: whole days, then the remainder on the last day.
+    # A remainder that lands exactly on close stays at that day's close.
+    whole_days, rem = divmod(remaining - available, _bh_day_seconds)
+    if rem == 0:
+        whole_days -= 1
+        rem = _bh_day_seconds
+    weeks, extra = divmod(int(whole_days) + 1, 5)
+    days_ahead = (weeks * 7) + extra
+    if cur.weekday() + extra >= 5:
+        days_ahead += 2
+    day_open = (cur + dt.timedelta(days=days_ahead)).replace(
+        hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0
+    )
+    return day_open + dt.timedelta(seconds=rem)
 
-        remaining -= available
-        cur = (cur + dt.timedelta(days=1)).replace(
-            hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0
-        )
-        while cur.weekday() >= 5:
-            cur = (cur + dt.timedelta(days=1)).replace(
-                hour=_bh_start_h, minute=_bh_start_m, second=0, microsecond=0
-            )
+# Locale-free formatting (the glibc-only "%-d"/"%-I" strftime flags are not portable)
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
-    return cur
+def _fmt_clock(d: dt.datetime) -> str:
+    h = d.hour
+    return f"{(h % 12) or 12}:{d.minute:02d}{'am' if h < 12 else 'pm'}"  # e.g. "1:01pm"
 
 def _fmt_date_local(d: dt.datetime) -> str:
-    return d.strftime("%b %-d")  # e.g. "Feb 25"
+    return f"{_MONTHS[d.month - 1]} {d.day}"  # e.g. "Feb 25"
 
 def _fmt_as_of_local(d: dt.datetime) -> str:
-    return d.strftime("%-I:%M%p").lower() + " CT"  # e.g. "1:01p CT"
+    return _fmt_clock(d) + " CT"  # e.g. "1:01pm CT"
 
 def ghl_conversation_link(conversation_id: Optional[str]) -> Optional[str]:
     if not conversation_id or not GHL_LOCATION_ID:
@@ -295,34 +344,114 @@ def ghl_conversation_link(conversation_id: Optional[str]) -> Optional[str]:
 # ==========================
 # GHL API helpers
 # ==========================
+# Built once; env config is fixed for the process lifetime. Treat as read-only.
+_GHL_HEADERS: Optional[Dict[str, str]] = None
+
 def _ghl_headers() -> Dict[str, str]:
+    global _GHL_HEADERS
+    if _GHL_HEADERS is not None:
+        return _GHL_HEADERS
     if not GHL_TOKEN:
         raise HTTPException(status_code=500, detail="Server missing GHL_TOKEN")
     if not GHL_LOCATION_ID:
         raise HTTPException(status_code=500, detail="Server missing GHL_LOCATION_ID")
-    return {
+    _GHL_HEADERS = {
         "Authorization": f"Bearer {GHL_TOKEN}",
         "Accept": "application/json",
         "Content-Type": "application/json",
         "Version": GHL_VERSION,
         "LocationId": GHL_LOCATION_ID,   # <-- THIS is the fix
     }
+    return _GHL_HEADERS
+
+# One keep-alive pool for the process lifetime (opened at startup, closed at shutdown).
+_ghl_client: Optional[httpx.AsyncClient] = None
+
+def _ghl_http() -> httpx.AsyncClient:
+    global _ghl_client
+    if _ghl_client is None:
+        _ghl_client = httpx.AsyncClient(
+            base_url=GHL_BASE_URL,
+            # Pool/http2 settings live on the transport once one is passed; retries= covers connect failures.
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            ),
+            timeout=httpx.Timeout(20.0, connect=5.0, pool=5.0),
+        )
+    return _ghl_client
 
-async def ghl_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    url = GHL_BASE_URL.rstrip("/") + path
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        r = await client.get(url, headers=_ghl_headers(), params=params or {})
+# Same idea for the AI gate: reuse one TLS session instead of a client per call.
+_ai_client: Optional[httpx.AsyncClient] = None
+
+def _ai_http() -> httpx.AsyncClient:
+    global _ai_client
+    if _ai_client is None:
+        _ai_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+            timeout=AI_GATE_TIMEOUT_SECONDS,
+        )
+    return _ai_client
+
+_GHL_ERROR_PREVIEW_BYTES = 300
+
+GHL_MAX_RETRIES = int(os.getenv("GHL_MAX_RETRIES", "3"))
+_GHL_RETRY_MAX_SLEEP_SECONDS = 8.0
+
+def _ghl_should_retry(method: str, status_code: int) -> bool:
+    # 429 means the request was not processed, so any method is safe to resend.
+    # 5xx on a POST may already have sent the SMS; only retry reads.
+    if status_code == 429:
+        return True
+    return method == "GET" and status_code in (502, 503, 504)
+
+def _ghl_retry_delay(r: httpx.Response, attempt: int) -> float:
+    retry_after = r.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(_GHL_RETRY_MAX_SLEEP_SECONDS, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(_GHL_RETRY_MAX_SLEEP_SECONDS, 0.25 * 2 ** attempt) + random.random() * 0.1
+
+async def _ghl_request(
+    method: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    payload: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    client = _ghl_http()
+    # orjson bytes body; Content-Type comes from _ghl_headers()
+    body = orjson.dumps(payload) if payload is not None else None
+    req = client.build_request(method, path, headers=_ghl_headers(), params=params, content=body)
+    r = await client.send(req, stream=True)
+    attempt = 0
+    while attempt < GHL_MAX_RETRIES and _ghl_should_retry(method, r.status_code):
+        delay = _ghl_retry_delay(r, attempt)
+        await r.aclose()
+        await asyncio.sleep(delay)
+        attempt += 1
+        r = await client.send(req, stream=True)
+    try:
         if r.status_code >= 400:
-            raise HTTPException(status_code=502, detail=f"GHL GET {path} failed: {r.status_code} {r.text[:300]}")
-        return r.json()
+            # Error bodies can be large; read only enough for the message preview.
+            preview = b""
+            async for chunk in r.aiter_bytes():
+                preview += chunk
+                if len(preview) >= _GHL_ERROR_PREVIEW_BYTES:
+                    break
+            preview_s = preview[:_GHL_ERROR_PREVIEW_BYTES].decode("utf-8", "replace")
+            raise HTTPException(status_code=502, detail=f"GHL {method} {path} failed: {r.status_code} {preview_s}")
+        return orjson.loads(await r.aread())
+    finally:
+        await r.aclose()
+
+async def ghl_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return await _ghl_request("GET", path, params=params or {})
 
 async def ghl_post(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    url = GHL_BASE_URL.rstrip("/") + path
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        r = await client.post(url, headers=_ghl_headers(), json=payload)
-        if r.status_code >= 400:
-            raise HTTPException(status_code=502, detail=f"GHL POST {path} failed: {r.status_code} {r.text[:300]}")
-        return r.json()
+    return await _ghl_request("POST", path, payload=payload)
 
 async def ghl_list_messages(conversation_id: str, limit: int = 50) -> List[Dict[str, Any]]:
     """
@@ -362,13 +491,50 @@ async def ghl_send_message(conversation_id: str, contact_id: str, message_text:
         "conversationId": conversation_id,
         "contactId": contact_id,
     }
-    return await ghl_post("/conversations/messages", payload)
-
+    try:
+        resp = await ghl_post("/conversations/messages", payload)
+    except Exception:
+        # The cached thread may be gone; make the next search hit GHL.
+        _forget_conversation_id(contact_id, conversation_id)
+        raise
+    observed = resp.get("conversationId") if isinstance(resp, dict) else None
+    if isinstance(observed, str) and observed and observed != conversation_id and contact_id:
+        _forget_conversation_id(contact_id, conversation_id)
+        _cache_conversation_id(contact_id, observed)
+    return resp
+
+
+# contact_id -> (expires_monotonic, name). Only successful lookups are cached so
+# a contact that gains a name in GHL is picked up on the next miss.
+CONTACT_NAME_CACHE_TTL_SECONDS = 900.0
+CONTACT_NAME_CACHE_MAX = 10000
+_contact_name_cache: Dict[str, Tuple[float, str]] = {}
+# In-flight lookups, so a burst of first hits for one contact shares a single request.
+_contact_name_inflight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
 
 async def ghl_get_contact_name(contact_id: Optional[str]) -> Optional[str]:
-    """Best-effort contact name lookup via GHL Contacts API."""
+    """Best-effort contact name lookup via GHL Contacts API (cached for CONTACT_NAME_CACHE_TTL_SECONDS)."""
     if not contact_id:
         return None
+    now = time.monotonic()
+    hit = _contact_name_cache.get(contact_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    pending = _contact_name_inflight.get(contact_id)
+    if pending is None:
+        pending = asyncio.ensure_future(_fetch_contact_name(contact_id))
+        _contact_name_inflight[contact_id] = pending
+        pending.add_done_callback(lambda _f, cid=contact_id: _contact_name_inflight.pop(cid, None))
+    # shield: one cancelled waiter must not cancel the lookup the others share
+    name = await asyncio.shield(pending)
+    if name:
+        # FIFO eviction (oldest insert first); refreshing an existing key needs no room.
+        if contact_id not in _contact_name_cache and len(_contact_name_cache) >= CONTACT_NAME_CACHE_MAX:
+            _contact_name_cache.pop(next(iter(_contact_name_cache)))
+        _contact_name_cache[contact_id] = (now + CONTACT_NAME_CACHE_TTL_SECONDS, name)
+    return name
+
+async def _fetch_contact_name(contact_id: str) -> Optional[str]:
     try:
         data = await ghl_get(f"/contacts/{contact_id}")
     except Exception:
@@ -392,21 +558,91 @@ async def ghl_get_contact_name(contact_id: Optional[str]) -> Optional[str]:
     
     return None
 
+# Max concurrent GHL lookups per batch (keeps fan-out inside GHL rate limits).
+GHL_LOOKUP_CONCURRENCY = 16
+
+async def ghl_get_contact_names(contact_ids: List[Optional[str]]) -> List[Optional[str]]:
+    """
+    Concurrent ghl_get_contact_name for a batch; results align with contact_ids.
+    Failed lookups yield None.
+    """
+    sem = asyncio.Semaphore(GHL_LOOKUP_CONCURRENCY)
+
+    async def _one(contact_id: Optional[str]) -> Optional[str]:
+        async with sem:
+            return await ghl_get_contact_name(contact_id)
+
+    results = await asyncio.gather(*[_one(cid) for cid in contact_ids], return_exceptions=True)
+    return [r if isinstance(r, str) else None for r in results]
+
+async def ghl_list_messages_many(
+    conversation_ids: Iterable[Optional[str]], limit: int = 50
+) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+    """
+    Concurrent ghl_list_messages for each distinct conversation id.
+    A GHL error for a conversation maps to None (callers skip it).
+    """
+    unique = list(dict.fromkeys(cid for cid in conversation_ids if cid))
+    sem = asyncio.Semaphore(GHL_LOOKUP_CONCURRENCY)
+
+    async def _one(conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        async with sem:
+            try:
+                return await ghl_list_messages(conversation_id, limit=limit)
+            except HTTPException:
+                return None
+
+    results = await asyncio.gather(*[_one(cid) for cid in unique])
+    return dict(zip(unique, results))
+
+# contact_id (or "p:<phone>") -> (expires_monotonic, conversation_id). The newest
+# thread is stable for minutes; ghl_send_message refreshes/drops entries it disproves.
+CONVERSATION_ID_CACHE_TTL_SECONDS = 120.0
+CONVERSATION_ID_CACHE_MAX = 20000
+_conversation_id_cache: Dict[str, Tuple[float, str]] = {}
+
+def _cache_conversation_id(key: str, conversation_id: str) -> None:
+    # FIFO eviction, only when a new key needs room.
+    if key not in _conversation_id_cache and len(_conversation_id_cache) >= CONVERSATION_ID_CACHE_MAX:
+        _conversation_id_cache.pop(next(iter(_conversation_id_cache)))
+    _conversation_id_cache[key] = (time.monotonic() + CONVERSATION_ID_CACHE_TTL_SECONDS, conversation_id)
+
+def _forget_conversation_id(contact_id: Optional[str], conversation_id: str) -> None:
+    # Drop every alias of a disproved thread: the contact id, any "p:<phone>" key
+    # and the manager entry, so no lookup path keeps returning the stale id.
+    for cache in (_conversation_id_cache, _manager_conversation_cache):
+        if contact_id:
+            cache.pop(contact_id, None)
+        for key in [k for k, (_, cid) in cache.items() if cid == conversation_id]:
+            del cache[key]
+
 async def ghl_find_conversation_id_for_contact(contact_id: Optional[str], phone: Optional[str]) -> Optional[str]:
     """
     Deterministic: call conversations/search and return the newest conversation id.
     Prefers contact_id; falls back to phone if contact_id missing.
+    Found ids are cached briefly (CONVERSATION_ID_CACHE_TTL_SECONDS).
 
     NOTE: response shape can vary; we normalize common shapes.
     """
     params: Dict[str, Any] = {}
     if contact_id:
         params["contactId"] = contact_id
+        key = contact_id
     elif phone:
         params["phone"] = phone
+        key = f"p:{phone}"
     else:
         return None
 
+    hit = _conversation_id_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    conv_id = await _search_conversation_id(params)
+    if conv_id:
+        _cache_conversation_id(key, conv_id)
+    return conv_id
+
+async def _search_conversation_id(params: Dict[str, Any]) -> Optional[str]:
     data = await ghl_get("/conversations/search", params=params)
 
     if isinstance(data, dict):
@@ -463,61 +699,144 @@ def _has_missed_call_marker(payload: Dict[str, Any]) -> bool:
 # ==========================
 # Spam helper
 # ==========================
-def _is_spam(conn: sqlite3.Connection, phone: Optional[str]) -> bool:
+# spam_phones mirrored in memory: the table is tiny and rarely changes, so lookups
+# skip SQLite. Our own writes update the set directly; the periodic reload picks up
+# edits made outside the app (operators using the sqlite3 CLI on sentinel.db).
+SPAM_PHONES_RELOAD_SECONDS = float(os.getenv("SPAM_PHONES_RELOAD_SECONDS", "60"))
+_spam_phones: Set[str] = set()
+_spam_phones_expires = 0.0
+_spam_lock = threading.Lock()
+_spam_refresh_task: Optional["asyncio.Task[None]"] = None
+
+def _load_spam_phones() -> None:
+    global _spam_phones, _spam_phones_expires
+    # Read and swap under the lock: a mark_spam_many committing in another thread
+    # either lands before the SELECT or adds its phones to the new set afterwards.
+    with _spam_lock:
+        _spam_phones = {r[0] for r in db().execute("SELECT phone FROM spam_phones")}
+        _spam_phones_expires = time.monotonic() + SPAM_PHONES_RELOAD_SECONDS
+
+def _refresh_spam_phones_soon() -> None:
+    """Reloads the spam set on a worker thread; lookups keep using the current set meanwhile."""
+    global _spam_refresh_task
+    if _spam_refresh_task is not None and not _spam_refresh_task.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _load_spam_phones()
+        return
+    _spam_refresh_task = loop.create_task(asyncio.to_thread(_load_spam_phones))
+    _spam_refresh_task.add_done_callback(_forget_background_task)
+
+def _is_spam(phone: Optional[str]) -> bool:
     if not phone:
         return False
-    row = conn.execute("SELECT 1 FROM spam_phones WHERE phone = ?", (phone,)).fetchone()
-    return row is not None
+    if time.monotonic() >= _spam_phones_expires:
+        _refresh_spam_phones_soon()
+    return phone in _spam_phones
 
-def mark_spam(phone: str) -> None:
+def mark_spam_many(phones: Iterable[str]) -> None:
+    now = _now_iso()
+    rows = [(p, now) for p in dict.fromkeys(phones) if p]
+    if not rows:
+        return
     conn = db()
-    conn.execute(
-        "INSERT OR IGNORE INTO spam_phones (phone, created_ts) VALUES (?, ?)",
-        (phone, _now_local().isoformat())
-    )
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO spam_phones (phone, created_ts) VALUES (?, ?)",
+            rows,
+        )
+    with _spam_lock:
+        _spam_phones.update(p for p, _ in rows)
+
+def mark_spam(phone: str) -> None:
+    mark_spam_many([phone])
 
 
 # ==========================
 # KV store helpers
 # ==========================
+# Coroutines use the *_async forms, which run the sync helper on the default
+# threadpool (asyncio.to_thread) so a slow SQLite call never stalls the event
+# loop. Each worker thread gets its own connection via db().
 def kv_get(key: str) -> Optional[str]:
     conn = db()
     row = conn.execute("SELECT value FROM kv_store WHERE key=?", (key,)).fetchone()
-    conn.close()
     return row["value"] if row else None
 
 def kv_set(key: str, value: str) -> None:
     conn = db()
-    conn.execute("INSERT INTO kv_store(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value", (key, value))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("INSERT INTO kv_store(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value", (key, value))
 
-def _update_issue_meta(issue_id: int, updates: Dict[str, Any]) -> None:
+def kv_get_many(keys: Iterable[str]) -> Dict[str, str]:
+    keys = list(keys)
+    if not keys:
+        return {}
     conn = db()
-    row = conn.execute("SELECT meta FROM issues WHERE id=?", (issue_id,)).fetchone()
-    if not row:
-        conn.close()
+    rows = conn.execute(
+        f"SELECT key, value FROM kv_store WHERE key IN ({','.join('?' * len(keys))})", keys
+    ).fetchall()
+    return {r["key"]: r["value"] for r in rows}
+
+def kv_set_many(items: Dict[str, str]) -> None:
+    if not items:
         return
-    try:
-        meta = json.loads(row["meta"] or "{}")
-    except Exception:
-        meta = {}
-    meta.update(updates or {})
-    conn.execute("UPDATE issues SET meta=? WHERE id=?", (json.dumps(meta), issue_id))
-    conn.commit()
-    conn.close()
+    conn = db()
+    with conn:
+        conn.executemany(
+            "INSERT INTO kv_store(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            list(items.items()),
+        )
+
+async def kv_get_async(key: str) -> Optional[str]:
+    return await asyncio.to_thread(kv_get, key)
 
+async def kv_set_async(key: str, value: str) -> None:
+    await asyncio.to_thread(kv_set, key, value)
 
-def _set_resolved_metadata(issue_id: int, resolved_by: str, extra: Optional[Dict[str, Any]] = None) -> None:
+async def kv_get_many_async(keys: Iterable[str]) -> Dict[str, str]:
+    return await asyncio.to_thread(kv_get_many, list(keys))
+
+async def kv_set_many_async(items: Dict[str, str]) -> None:
+    await asyncio.to_thread(kv_set_many, dict(items))
+
+def _update_issue_meta(issue_id: int, updates: Dict[str, Any], commit: bool = True) -> None:
+    # commit=False lets a caller fold this into its own transaction (`with conn:`)
+    if not updates:
+        return
+    # Merge in SQL (one statement, no read-modify-write). json_set rather than
+    # json_patch: patch would treat None as "delete key", update() stores null.
+    params: List[Any] = []
+    for k, v in updates.items():
+        params.append(f'$."{k}"')  # keys are fixed identifiers from this module
+        params.append(orjson.dumps(v).decode())
+    params.append(issue_id)
+    sql = (
+        "UPDATE issues SET meta=json_set("
+        "CASE WHEN json_valid(meta) AND json_type(meta)='object' THEN meta ELSE '{}' END, "
+        + ", ".join(["?, json(?)"] * len(updates))
+        + ") WHERE id=?"
+    )
+    conn = db()
+    if commit:
+        with conn:
+            conn.execute(sql, params)
+    else:
+        conn.execute(sql, params)
+
+
+def _set_resolved_metadata(
+    issue_id: int, resolved_by: str, extra: Optional[Dict[str, Any]] = None, commit: bool = True
+) -> None:
     payload: Dict[str, Any] = {
         "resolved_by": resolved_by,
-        "resolved_meta_ts": _now_local().isoformat(),
+        "resolved_meta_ts": _now_iso(),
     }
     if extra:
         payload.update(extra)
-    _update_issue_meta(issue_id, payload)
+    _update_issue_meta(issue_id, payload, commit=commit)
 
 
 # ==========================
@@ -525,37 +844,131 @@ def _set_resolved_metadata(issue_id: int, resolved_by: str, extra: Optional[Dict
 # ==========================
 async def _parse_request_payload(request: Request) -> Dict[str, Any]:
     content_type = (request.headers.get("content-type") or "").lower()
-    raw_body = await request.body()
-    payload: Dict[str, Any] = {
-        "_meta": {
-            "content_type": content_type,
-            "content_length": len(raw_body),
-        }
+    # Read incrementally so an oversized body is rejected before it is fully buffered.
+    declared = request.headers.get("content-length")
+    size = int(declared) if declared and declared.isdigit() else 0
+    if size > MAX_WEBHOOK_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Payload too large")
+    # Pre-size from Content-Length so chunks are copied in place instead of regrowing the buffer.
+    buf = bytearray(size)
+    pos = 0
+    async for chunk in request.stream():
+        end = pos + len(chunk)
+        if end > MAX_WEBHOOK_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="Payload too large")
+        if end <= size:
+            buf[pos:end] = chunk
+        else:
+            buf[pos:] = chunk
+        pos = end
+    raw_body = bytes(buf) if pos == len(buf) else bytes(buf[:pos])
+    meta: Dict[str, Any] = {
+        "content_type": content_type,
+        "content_length": len(raw_body),
     }
 
     if "application/json" in content_type and raw_body.strip():
         try:
-            payload.update(json.loads(raw_body.decode("utf-8")))
+            # Build the result in one go rather than growing a {"_meta": ...} dict.
+            return {**orjson.loads(raw_body), "_meta": meta}
         except Exception as e:
-            payload["_meta"]["json_error"] = str(e)
-            payload["_raw"] = raw_body.decode("utf-8", errors="replace")
-    else:
+            meta["json_error"] = str(e)
+            return {"_meta": meta, "_raw": raw_body.decode("utf-8", errors="replace")}
+
+    # The stream is consumed, so forms are parsed from raw_body rather than request.form().
+    try:
+        if "application/x-www-form-urlencoded" in content_type:
+            form = dict(parse_qsl(raw_body.decode("utf-8", errors="replace"), keep_blank_values=True))
+            return {"_meta": meta, **form}
+        if "multipart/form-data" in content_type:
+            form = await MultiPartParser(request.headers, _single_chunk(raw_body)).parse()
+            return {"_meta": meta, **form}
+    except Exception as e:
+        meta["form_error"] = str(e)
+    return {"_meta": meta, "_raw": raw_body.decode("utf-8", errors="replace")}
+
+async def _single_chunk(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+# Raw events are queued by the request path and written in batches by a single
+# background task (one executemany + commit per burst). The queue is bounded;
+# on overflow the oldest pending event is dropped.
+RAW_EVENT_QUEUE_MAX = 10000
+RAW_EVENT_BATCH_MAX = 256
+RAW_EVENT_FLUSH_SECONDS = 0.05
+
+_raw_event_q: Optional["asyncio.Queue[Optional[Tuple[str, str, str]]]"] = None
+_raw_event_writer_task: Optional["asyncio.Task[None]"] = None
+
+def _insert_raw_events(rows: List[Tuple[str, str, str]]) -> None:
+    conn = db()
+    with conn:
+        conn.executemany(
+            "INSERT INTO raw_events (received_ts, source, payload) VALUES (?, ?, ?)",
+            rows,
+        )
+
+def _enqueue_raw_event(item: Optional[Tuple[str, str, str]]) -> None:
+    q = _raw_event_q
+    assert q is not None
+    try:
+        q.put_nowait(item)
+    except asyncio.QueueFull:
         try:
-            form = await request.form()
-            payload.update(dict(form))
-        except Exception as e:
-            payload["_meta"]["form_error"] = str(e)
-            payload["_raw"] = raw_body.decode("utf-8", errors="replace")
-    return payload
+            q.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        q.put_nowait(item)
+
+async def _raw_event_writer(q: "asyncio.Queue[Optional[Tuple[str, str, str]]]") -> None:
+    while True:
+        batch = [await q.get()]
+        await asyncio.sleep(RAW_EVENT_FLUSH_SECONDS)  # let a burst accumulate
+        while len(batch) < RAW_EVENT_BATCH_MAX and not q.empty():
+            batch.append(q.get_nowait())
+        rows = [r for r in batch if r is not None]
+        if rows:
+            try:
+                await asyncio.to_thread(_insert_raw_events, rows)
+            except Exception as e:
+                print(f"raw_events writer: dropped {len(rows)} event(s): {type(e).__name__}: {e}")
+        if len(rows) != len(batch):  # None is the shutdown sentinel
+            return
+
+def _start_raw_event_writer() -> None:
+    global _raw_event_q, _raw_event_writer_task
+    _raw_event_q = asyncio.Queue(maxsize=RAW_EVENT_QUEUE_MAX)
+    _raw_event_writer_task = asyncio.create_task(_raw_event_writer(_raw_event_q))
+
+async def _stop_raw_event_writer() -> None:
+    global _raw_event_q, _raw_event_writer_task
+    q, task = _raw_event_q, _raw_event_writer_task
+    _raw_event_q, _raw_event_writer_task = None, None
+    if q is None or task is None:
+        return
+    try:
+        q.put_nowait(None)
+    except asyncio.QueueFull:
+        task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    leftover = []
+    while not q.empty():
+        item = q.get_nowait()
+        if item is not None:
+            leftover.append(item)
+    if leftover:
+        _insert_raw_events(leftover)
 
 def _log_raw_event(source: str, payload: Dict[str, Any]) -> None:
-    conn = db()
-    conn.execute(
-        "INSERT INTO raw_events (received_ts, source, payload) VALUES (?, ?, ?)",
-        (dt.datetime.utcnow().isoformat(), source, json.dumps(payload))
-    )
-    conn.commit()
-    conn.close()
+    # Serialize now: handlers keep using (and may mutate) the payload afterwards.
+    row = (_utc_now_iso_coarse(), source, orjson.dumps(payload).decode())
+    if _raw_event_q is None:  # writer not running (e.g. outside the app lifecycle)
+        _insert_raw_events([row])
+        return
+    _enqueue_raw_event(row)
 
 def _flow_who(contact_name: Optional[str], phone: Optional[str], contact_id: Optional[str]) -> str:
     if isinstance(contact_name, str) and contact_name.strip():
@@ -575,157 +988,92 @@ def _flow_log(event: str, **fields: Any) -> None:
     if not FLOW_LOG_ENABLED:
         return
     payload = {
-        "ts": dt.datetime.now(tz=ZoneInfo(TZ_NAME)).isoformat(),
+        "ts": _now_iso(),
         "event": event,
     }
     for k, v in fields.items():
         if v is not None:
             payload[k] = v
-    print("FLOW " + json.dumps(payload, separators=(",", ":"), ensure_ascii=True))
-
-# ---- Manager LIST pagination (in-memory) ----
-# Keyed by manager contact_id. Resets on restart (fine).
-_MANAGER_LIST_OFFSETS: dict[str, int] = {}
-
-def _mask_phone(phone: str) -> str:
-    p = (phone or "").strip()
-    # expects +1XXXXXXXXXX
-    if len(p) >= 12 and p.startswith("+1"):
-        return "+1***" + p[-4:]
-    if len(p) >= 4:
-        return "***" + p[-4:]
-    return p or "Unknown"
-
-def _fmt_time_local(dt) -> str:
-    # dt may already be a datetime; your codebase likely uses aware dt.
-    # Keep it simple: match your summary style (e.g., 10:19pm)
     try:
-        return dt.strftime("%-I:%M%p").lower()
-    except Exception:
-        try:
-            return dt.strftime("%I:%M%p").lstrip("0").lower()
-        except Exception:
-            return str(dt)
-
-def _format_issue_line_like_summary(r: dict) -> str:
-    """
-    Formats a single issue line in the same style as the summary:
-    #ID NameOrMaskedPhone — <last_time> | due <due_time> [in=N for SMS]
-    """
-    iid = r.get("id")
-    phone = r.get("phone") or ""
-    contact_name = r.get("contact_name") or r.get("contact") or ""  # depending on your schema
-    label = contact_name if contact_name and not contact_name.startswith(("0", "1", "2", "3", "4", "5", "6", "7", "8", "9")) else ""
-    who = label if label else _mask_phone(phone)
-
-    last_dt = r.get("last_in") or r.get("last_message_at") or r.get("last_seen_at")
-    due_dt = r.get("due_at") or r.get("due")
-
-    last_s = _fmt_time_local(last_dt) if last_dt else "?"
-    due_s = _fmt_time_local(due_dt) if due_dt else "?"
-
-    issue_type = r.get("issue_type") or r.get("type")  # 1=CALL? depends on your code
-    # In your existing output you label as [CALL] or [SMS]. We only need "in=N" for SMS.
-    inbound_count = r.get("inbound_count") or r.get("inbound") or 0
-
-    suffix = ""
-    # Only show in=N for texts (matches your summary)
-    # If your schema uses something else to tell SMS vs CALL, adjust this predicate.
-    if str(r.get("channel") or r.get("kind") or r.get("medium") or "").lower() in ("sms", "text"):
-        suffix = f" in={inbound_count}"
+        line = orjson.dumps(payload)
+    except TypeError:
+        line = b""
+    # Log lines stay ASCII-only; orjson has no ensure_ascii, so fall back when it emitted UTF-8.
+    if line and line.isascii():
+        print("FLOW " + line.decode("ascii"))
     else:
-        # fallback: if your existing issues store something like r["is_sms"] or message types
-        if r.get("is_sms") or r.get("sms") or r.get("text"):
-            suffix = f" in={inbound_count}"
-
-    return f"#{iid} {who} — {last_s} | due {due_s}{suffix}".strip()
-
-def _render_list_like_summary(issues: list[dict], total_open: int, offset: int, limit: int) -> str:
-    """
-    Render as:
-    OPEN (total) showing X-Y
-    Calls (N):
-    ...
-    Texts (N):
-    ...
-    More (if available)
-    """
-    calls = []
-    texts = []
-
-    for r in issues:
-        # Decide if CALL vs SMS the same way your summary does.
-        # Adjust these predicates to match your schema.
-        is_sms = False
-        t = (r.get("channel") or r.get("kind") or r.get("medium") or "").lower()
-        if t in ("sms", "text"):
-            is_sms = True
-        if r.get("is_sms") or r.get("sms") or r.get("text"):
-            is_sms = True
-
-        line = _format_issue_line_like_summary(r)
-        (texts if is_sms else calls).append(line)
-
-    start = offset + 1 if total_open else 0
-    end = min(offset + limit, total_open)
-
-    lines = []
-    lines.append(f"OPEN ({total_open}) — showing {start}-{end}")
-    if calls:
-        lines.append(f"Calls ({len(calls)}):")
-        lines.extend(calls)
-    if texts:
-        lines.append(f"Texts ({len(texts)}):")
-        lines.extend(texts)
-
-    if end < total_open:
-        lines.append("Reply: More")
-    else:
-        lines.append("End of list. Reply: List")
-
-    return "\n".join(lines)
+        print("FLOW " + json.dumps(payload, separators=(",", ":"), ensure_ascii=True))
 
 def get_issue_by_id(issue_id: int) -> Optional[sqlite3.Row]:
     conn = db()
     row = conn.execute("SELECT * FROM issues WHERE id=?", (issue_id,)).fetchone()
-    conn.close()
     return row
 
 def resolve_by_id(issue_id: int, status: str = "RESOLVED") -> int:
     conn = db()
-    now = _now_local().isoformat()
-    cur = conn.execute(
-        "UPDATE issues SET status=?, resolved_ts=? WHERE status='OPEN' AND id=?",
-        (status, now, issue_id),
-    )
-    conn.commit()
-    conn.close()
-    if cur.rowcount > 0 and status == "RESOLVED":
-        _set_resolved_metadata(issue_id, "MANUAL_COMMAND_ID")
+    now = _now_iso()
+    with conn:
+        cur = conn.execute(
+            "UPDATE issues SET status=?, resolved_ts=? WHERE status='OPEN' AND id=?",
+            (status, now, issue_id),
+        )
+        if cur.rowcount > 0 and status == "RESOLVED":
+            _set_resolved_metadata(issue_id, "MANUAL_COMMAND_ID", commit=False)
+    if cur.rowcount > 0:
+        _invalidate_open_count()
     return cur.rowcount
 
-def add_note(issue_id: int, note: str) -> bool:
+def resolve_by_ids(issue_ids: List[int], status: str = "RESOLVED") -> List[int]:
+    """Resolves every OPEN issue in issue_ids in one statement; returns the changed ids in input order."""
+    if not issue_ids:
+        return []
     conn = db()
-    row = conn.execute("SELECT meta FROM issues WHERE id=?", (issue_id,)).fetchone()
-    if not row:
-        conn.close()
-        return False
-    try:
-        meta = json.loads(row["meta"] or "{}")
-    except Exception:
-        meta = {}
-    notes = meta.get("notes") or []
-    notes.append({"ts": _now_local().isoformat(), "text": note[:500]})
-    meta["notes"] = notes
-    conn.execute("UPDATE issues SET meta=? WHERE id=?", (json.dumps(meta), issue_id))
-    conn.commit()
-    conn.close()
-    return True
+    now = _now_iso()
+    q = (
+        "UPDATE issues SET status=?, resolved_ts=? WHERE status='OPEN' AND id IN (%s) RETURNING id"
+        % ",".join(["?"] * len(issue_ids))
+    )
+    with conn:
+        changed = {r["id"] for r in conn.execute(q, [status, now] + list(issue_ids)).fetchall()}
+        if status == "RESOLVED":
+            for iid in changed:
+                _set_resolved_metadata(iid, "MANUAL_COMMAND_ID", commit=False)
+    if changed:
+        _invalidate_open_count()
+    return [iid for iid in issue_ids if iid in changed]
+
+def get_issue_phones(issue_ids: List[int]) -> List[str]:
+    if not issue_ids:
+        return []
+    conn = db()
+    q = "SELECT phone FROM issues WHERE id IN (%s) AND phone IS NOT NULL AND phone<>''" % ",".join(["?"] * len(issue_ids))
+    return [r["phone"] for r in conn.execute(q, list(issue_ids)).fetchall()]
 
+def add_note(issue_id: int, note: str) -> bool:
+    # One UPDATE appends in-engine (JSON1); there is no SELECT first, rowcount tells
+    # us whether the issue exists. Invalid or non-object meta starts over as {} and a
+    # missing or non-array `notes` becomes a new array (the old Python path raised on those).
+    conn = db()
+    with conn:
+        cur = conn.execute(
+            """
+            UPDATE issues SET meta = json_set(
+              CASE WHEN json_valid(meta) AND json_type(meta) = 'object' THEN meta ELSE '{}' END,
+              '$.notes',
+              json_insert(
+                CASE WHEN json_valid(meta) AND json_type(meta, '$.notes') = 'array'
+                     THEN json_extract(meta, '$.notes') ELSE '[]' END,
+                '$[#]', json_object('ts', ?, 'text', ?)
+              )
+            )
+            WHERE id=?
+            """,
+            (_now_iso(), note[:500], issue_id),
+        )
+    return cur.rowcount > 0
 
-# ---- Manager LIST paging state (in-memory) ----
-_MANAGER_LIST_OFFSETS: dict[str, int] = {}
 
+@lru_cache(maxsize=8192)
 def _mask_phone(phone: str) -> str:
     p = (phone or "").strip()
     if p.startswith("+1") and len(p) >= 12:
@@ -734,6 +1082,7 @@ def _mask_phone(phone: str) -> str:
         return "***" + p[-4:]
     return p or "Unknown"
 
+@lru_cache(maxsize=4096)
 def _fmt_hhmm_ampm(value) -> str:
     """
     Convert a datetime or ISO-ish timestamp to 'h:mmap' like the summary (e.g., 3:41pm).
@@ -768,47 +1117,62 @@ def _fmt_hhmm_ampm(value) -> str:
                 except Exception:
                     return "?"
 
-    try:
-        return parsed.strftime("%-I:%M%p").lower()
-    except Exception:
-        return parsed.strftime("%I:%M%p").lstrip("0").lower()
+    return _fmt_clock(parsed)
+
+# LIST/MORE header count. Status transitions into or out of OPEN call
+# _invalidate_open_count(); the TTL only bounds how long a page burst reuses it.
+OPEN_COUNT_CACHE_TTL_SECONDS = 5.0
+_OPEN_COUNT_CACHE: Dict[str, float] = {"expires": 0.0, "n": 0}
+
+def _open_count(conn: sqlite3.Connection) -> int:
+    now = time.monotonic()
+    if now < _OPEN_COUNT_CACHE["expires"]:
+        return int(_OPEN_COUNT_CACHE["n"])
+    n = conn.execute("SELECT COUNT(*) AS n FROM issues WHERE status='OPEN'").fetchone()["n"]
+    _OPEN_COUNT_CACHE.update(expires=now + OPEN_COUNT_CACHE_TTL_SECONDS, n=n)
+    return int(n)
+
+def _invalidate_open_count() -> None:
+    _OPEN_COUNT_CACHE["expires"] = 0.0
 
-def list_open_issues(limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
+def list_open_issues(
+    limit: int = 20, offset: int = 0, after: Optional[Tuple[str, int]] = None
+) -> tuple[list[dict], int]:
     """
-    Returns (rows, total_open) ordered by due_ts ASC.
+    Returns (rows, total_open) ordered by (due_ts, id) ASC.
     Rows are dicts with the columns we need for summary-like formatting.
+    When `after` is a (due_ts, id) cursor from the previous page, rows resume
+    right after it and `offset` is ignored.
     """
     conn = db()
-    total = conn.execute("""
-        SELECT COUNT(*) AS n
+    # Two index-only queries: COUNT(*) OVER () would buffer and re-sort every
+    # OPEN row just to return one page (measured ~60x slower at 40k OPEN rows).
+    total = _open_count(conn)
+
+    # Defaults applied in SQL so each Row converts with a single dict() call.
+    # Keyset paging: idx_issues_status_due carries the rowid, so (due_ts, id)
+    # seeks straight to the cursor instead of stepping over OFFSET rows.
+    select = """
+        SELECT id, issue_type, phone, contact_id, contact_name, created_ts, due_ts,
+               COALESCE(inbound_count, 0) AS inbound_count,
+               COALESCE(NULLIF(last_inbound_ts, ''), created_ts) AS last_inbound_ts
         FROM issues
         WHERE status='OPEN'
-    """).fetchone()["n"]
-
-    rows = conn.execute("""
-        SELECT id, issue_type, phone, contact_id, contact_name, created_ts, due_ts, inbound_count, last_inbound_ts
-        FROM issues
-        WHERE status='OPEN'
-        ORDER BY due_ts ASC
-        LIMIT ? OFFSET ?
-    """, (limit, offset)).fetchall()
-    conn.close()
+    """
+    if after is not None:
+        rows = conn.execute(select + """
+            AND (due_ts, id) > (?, ?)
+            ORDER BY due_ts ASC, id ASC
+            LIMIT ?
+        """, (after[0], after[1], limit)).fetchall()
+    else:
+        rows = conn.execute(select + """
+            ORDER BY due_ts ASC, id ASC
+            LIMIT ? OFFSET ?
+        """, (limit, offset)).fetchall()
 
-    # sqlite Row -> dict
-    out = []
-    for r in rows:
-        out.append({
-            "id": r["id"],
-            "issue_type": r["issue_type"],  # "CALL" or "SMS" in your existing output
-            "phone": r["phone"],
-            "contact_id": r["contact_id"],
-            "contact_name": r["contact_name"],
-            "created_ts": r["created_ts"],
-            "due_ts": r["due_ts"],
-            "inbound_count": r["inbound_count"] if r["inbound_count"] is not None else 0,
-            "last_inbound_ts": r["last_inbound_ts"] or r["created_ts"],
-        })
-    return out, int(total)
+    # dicts, not Rows: LIST/MORE backfill contact_name on the returned rows
+    return [dict(r) for r in rows], int(total)
 
 def _render_list_like_summary(rows: list[dict], total_open: int, offset: int, limit: int) -> str:
     """
@@ -819,7 +1183,8 @@ def _render_list_like_summary(rows: list[dict], total_open: int, offset: int, li
 
     for r in rows:
         iid = r["id"]
-        it = (r.get("issue_type") or "").upper()
+        # issue_type is always written as 'SMS'/'CALL' (queries elsewhere match it exactly)
+        is_sms = r["issue_type"] == "SMS"
         phone = r.get("phone") or ""
         name = (r.get("contact_name") or "").strip()
         who = name if name else _mask_phone(phone)
@@ -827,14 +1192,13 @@ def _render_list_like_summary(rows: list[dict], total_open: int, offset: int, li
         last_s = _fmt_hhmm_ampm(r.get("last_inbound_ts") or "")
         due_s = _fmt_hhmm_ampm(r.get("due_ts") or "")
 
-        line = f"#{iid} {who} — {last_s} | due {due_s}"
-        if it == "SMS":
+        # one format op per row (no `line +=` rebuild for the SMS count suffix)
+        if is_sms:
             n = int(r.get("inbound_count", 0) or 0)
-            if n > 1:
-                line += f" ({n})"
-            texts.append(line)
+            suffix = f" ({n})" if n > 1 else ""
+            texts.append(f"#{iid} {who} — {last_s} | due {due_s}{suffix}")
         else:
-            calls.append(line)
+            calls.append(f"#{iid} {who} — {last_s} | due {due_s}")
 
     start = offset + 1 if total_open else 0
     end = min(offset + limit, total_open)
@@ -856,81 +1220,96 @@ def _render_list_like_summary(rows: list[dict], total_open: int, offset: int, li
 
     return "\n".join(lines)
 
-def _set_issue_contact_name(issue_id: int, name: str) -> None:
-    if not name:
+def _set_issue_contact_names(pairs: List[Tuple[int, str]]) -> None:
+    """Backfills (issue_id, name) pairs in one transaction; existing names are kept."""
+    pairs = [(name, issue_id) for issue_id, name in pairs if name]
+    if not pairs:
         return
     conn = db()
-    conn.execute(
-        "UPDATE issues SET contact_name=? WHERE id=? AND (contact_name IS NULL OR contact_name='')",
-        (name, issue_id),
-    )
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.executemany(
+            "UPDATE issues SET contact_name=? WHERE id=? AND (contact_name IS NULL OR contact_name='')",
+            pairs,
+        )
 
 def resolve_by_phone(phone: str, status: str = "RESOLVED") -> int:
     conn = db()
-    now = _now_local().isoformat()
-    ids = [r["id"] for r in conn.execute("SELECT id FROM issues WHERE status='OPEN' AND phone=?", (phone,)).fetchall()]
-    cur = conn.execute("""
-        UPDATE issues
-        SET status=?, resolved_ts=?
-        WHERE status='OPEN' AND phone=?
-    """, (status, now, phone))
-    conn.commit()
-    conn.close()
-    if status == "RESOLVED":
-        for iid in ids:
-            _set_resolved_metadata(iid, "MANUAL_COMMAND_PHONE", {"resolve_target": phone})
+    now = _now_iso()
+    with conn:
+        ids = [r["id"] for r in conn.execute("SELECT id FROM issues WHERE status='OPEN' AND phone=?", (phone,)).fetchall()]
+        cur = conn.execute("""
+            UPDATE issues
+            SET status=?, resolved_ts=?
+            WHERE status='OPEN' AND phone=?
+        """, (status, now, phone))
+        if status == "RESOLVED":
+            for iid in ids:
+                _set_resolved_metadata(iid, "MANUAL_COMMAND_PHONE", {"resolve_target": phone}, commit=False)
+    if cur.rowcount > 0:
+        _invalidate_open_count()
     return cur.rowcount
 
 def resolve_by_contact_id(contact_id: str, status: str = "RESOLVED") -> int:
     conn = db()
-    now = _now_local().isoformat()
-    ids = [r["id"] for r in conn.execute("SELECT id FROM issues WHERE status='OPEN' AND contact_id=?", (contact_id,)).fetchall()]
-    cur = conn.execute("""
-        UPDATE issues
-        SET status=?, resolved_ts=?
-        WHERE status='OPEN' AND contact_id=?
-    """, (status, now, contact_id))
-    conn.commit()
-    conn.close()
-    if status == "RESOLVED":
-        for iid in ids:
-            _set_resolved_metadata(iid, "MANUAL_COMMAND_CONTACT_ID", {"resolve_target": contact_id})
+    now = _now_iso()
+    with conn:
+        ids = [r["id"] for r in conn.execute("SELECT id FROM issues WHERE status='OPEN' AND contact_id=?", (contact_id,)).fetchall()]
+        cur = conn.execute("""
+            UPDATE issues
+            SET status=?, resolved_ts=?
+            WHERE status='OPEN' AND contact_id=?
+        """, (status, now, contact_id))
+        if status == "RESOLVED":
+            for iid in ids:
+                _set_resolved_metadata(iid, "MANUAL_COMMAND_CONTACT_ID", {"resolve_target": contact_id}, commit=False)
+    if cur.rowcount > 0:
+        _invalidate_open_count()
     return cur.rowcount
 
+# Candidate rows for Resolve <name>. SQLite's instr()/lower() pre-filters ASCII
+# names; any name with a non-ASCII character is handed to Python, because
+# str.lower() can fold those into ASCII (e.g. KELVIN SIGN -> "k") and SQLite won't.
+# Both the contact_name column and the legacy meta copy are matched.
+_RESOLVE_BY_NAME_CANDIDATES_SQL = """
+    SELECT id, contact_name, meta_name FROM (
+        SELECT id, contact_name,
+               CASE WHEN json_valid(meta) THEN json_extract(meta, '$.contact_name') END AS meta_name
+        FROM issues
+        WHERE status='OPEN'
+    )
+    WHERE instr(lower(contact_name), :needle) > 0
+       OR instr(lower(meta_name), :needle) > 0
+       OR contact_name GLOB '*[^ -~]*'
+       OR meta_name GLOB '*[^ -~]*'
+"""
+
 def resolve_by_name(name: str, status: str = "RESOLVED") -> int:
     name_l = name.strip().lower()
     if not name_l:
         return 0
 
     conn = db()
-    rows = conn.execute("SELECT id, meta FROM issues WHERE status='OPEN'").fetchall()
-    matched_ids: List[int] = []
-
-    for r in rows:
-        try:
-            meta = json.loads(r["meta"] or "{}")
-        except Exception:
-            meta = {}
-        cn = (meta.get("contact_name") or "").lower()
-        if cn and name_l in cn:
-            matched_ids.append(r["id"])
-
-    now = _now_local().isoformat()
+    now = _now_iso()
+    with conn:
+        rows = conn.execute(_RESOLVE_BY_NAME_CANDIDATES_SQL, {"needle": name_l}).fetchall()
+        matched_ids = [
+            r["id"] for r in rows
+            if any(isinstance(n, str) and name_l in n.lower() for n in (r["contact_name"], r["meta_name"]))
+        ]
+        if matched_ids:
+            q = "UPDATE issues SET status=?, resolved_ts=? WHERE id IN (%s)" % ",".join(["?"] * len(matched_ids))
+            conn.execute(q, [status, now] + matched_ids)
+            if status == "RESOLVED":
+                for iid in matched_ids:
+                    _set_resolved_metadata(iid, "MANUAL_COMMAND_NAME", {"resolve_target": name}, commit=False)
     if matched_ids:
-        q = "UPDATE issues SET status=?, resolved_ts=? WHERE id IN (%s)" % ",".join(["?"] * len(matched_ids))
-        conn.execute(q, [status, now] + matched_ids)
-        conn.commit()
-
-    conn.close()
-    if status == "RESOLVED":
-        for iid in matched_ids:
-            _set_resolved_metadata(iid, "MANUAL_COMMAND_NAME", {"resolve_target": name})
+        _invalidate_open_count()
     return len(matched_ids)
 
+_CONTACT_ID_RE = re.compile(r"[A-Za-z0-9]{10,}")
+
 def _looks_like_contact_id(s: str) -> bool:
-    return bool(re.fullmatch(r"[A-Za-z0-9]{10,}", s))
+    return _CONTACT_ID_RE.fullmatch(s) is not None
 
 def resolve_target(target: str) -> int:
     t = target.strip()
@@ -977,26 +1356,26 @@ async def unanswered_call(request: Request):
     if "tech_sentinel" not in routes:
         return {"received": True, "ignored": "voicemail_route_not_tech_sentinel"}
 
-    contact_id = _extract_contact_id(payload)
-    from_phone = _extract_from_phone(payload)
-    conversation_id = _extract_conversation_id(payload)
-
-    contact_name = _extract_contact_name(payload)
-    if not contact_name:
-        try:
-            contact_name = await ghl_get_contact_name(contact_id)
-        except Exception:
-            contact_name = None
-    if not conversation_id:
-        try:
-            conversation_id = await ghl_find_conversation_id_for_contact(contact_id, from_phone)
-        except Exception:
-            conversation_id = None
+    fields = _extract_all(payload)
+    contact_id = fields.contact_id
+    from_phone = fields.from_phone
+    conversation_id = fields.conversation_id
+
+    contact_name = fields.contact_name
+    # Name and conversation lookups are independent; overlap them on the pooled client.
+    name_lookup = ghl_get_contact_name(contact_id) if not contact_name else None
+    conv_lookup = ghl_find_conversation_id_for_contact(contact_id, from_phone) if not conversation_id else None
+    if name_lookup is not None or conv_lookup is not None:
+        fetched_name, fetched_conv = await asyncio.gather(
+            lookup_or_none(name_lookup), lookup_or_none(conv_lookup)
+        )
+        if name_lookup is not None:
+            contact_name = fetched_name
+        if conv_lookup is not None:
+            conversation_id = fetched_conv
     who = _flow_who(contact_name, from_phone, contact_id)
 
-    conn = db()
-    if _is_spam(conn, from_phone):
-        conn.close()
+    if _is_spam(from_phone):
         _flow_log("call.ignored_spam", who=who, contact_id=contact_id, conversation_id=conversation_id)
         return {"received": True, "ignored": "spam_phone"}
 
@@ -1018,11 +1397,11 @@ async def unanswered_call(request: Request):
             suppressed=bool(ai_suppress),
         )
     if ai_suppress:
-        conn.close()
         return {"received": True, "ignored": "ai_inbound_suppress"}
 
     # Defensive dedupe: suppress repeated CALL issue creation when upstream workflow
     # emits duplicate webhook events for the same thread/contact in a short window.
+    conn = db()
     latest_call = None
     if conversation_id:
         latest_call = conn.execute(
@@ -1062,7 +1441,6 @@ async def unanswered_call(request: Request):
         ).fetchone()
 
     if latest_call and _is_recent(latest_call["created_ts"], now_local, CALL_DEDUPE_WINDOW_MINUTES):
-        conn.close()
         _flow_log(
             "call.ignored_recent_duplicate",
             who=who,
@@ -1076,18 +1454,17 @@ async def unanswered_call(request: Request):
     meta = {"source": "voicemail_route=tech_sentinel"}
     if contact_name:
         meta["contact_name"] = contact_name
-    cur = conn.execute("""
-        INSERT INTO issues (
-            issue_type, contact_id, phone, contact_name, created_ts, due_ts, status, meta,
-            conversation_id, first_inbound_ts, last_inbound_ts, inbound_count, outbound_count
-        )
-        VALUES ('CALL', ?, ?, ?, ?, ?, 'PENDING', ?, ?, ?, ?, 1, 0)
-    """, (
-        contact_id, from_phone, contact_name or None, created_ts, due_ts, json.dumps(meta),
-        conversation_id, created_ts, created_ts
-    ))
-    conn.commit()
-    conn.close()
+    with conn:
+        cur = conn.execute("""
+            INSERT INTO issues (
+                issue_type, contact_id, phone, contact_name, created_ts, due_ts, status, meta,
+                conversation_id, first_inbound_ts, last_inbound_ts, inbound_count, outbound_count
+            )
+            VALUES ('CALL', ?, ?, ?, ?, ?, 'PENDING', ?, ?, ?, ?, 1, 0)
+        """, (
+            contact_id, from_phone, contact_name or None, created_ts, due_ts, orjson.dumps(meta).decode(),
+            conversation_id, created_ts, created_ts
+        ))
     _flow_log(
         "call.issue_created",
         issue_id=cur.lastrowid,
@@ -1186,7 +1563,7 @@ async def _recent_staff_outbound_ts(conversation_id: str) -> Optional[dt.datetim
         try:
             set_last_internal_outbound(
                 conversation_id,
-                latest_staff_ts.astimezone(ZoneInfo(TZ_NAME)).isoformat(),
+                latest_staff_ts.astimezone(_TZ).isoformat(),
                 latest_staff_uid or None,
             )
         except Exception:
@@ -1197,9 +1574,9 @@ async def _recent_staff_outbound_ts(conversation_id: str) -> Optional[dt.datetim
 
 def _set_issue_status(issue_id: int, status: str) -> None:
     conn = db()
-    conn.execute("UPDATE issues SET status=? WHERE id=?", (status, issue_id))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("UPDATE issues SET status=? WHERE id=?", (status, issue_id))
+    _invalidate_open_count()
 
 
 def _has_outbound_after(msgs: List[Dict[str, Any]], first_inbound_ts: str) -> bool:
@@ -1216,7 +1593,7 @@ def _has_outbound_after(msgs: List[Dict[str, Any]], first_inbound_ts: str) -> bo
             continue
         try:
             cutoff_utc = cutoff.astimezone(dt.timezone.utc) if cutoff.tzinfo else cutoff.replace(
-                tzinfo=ZoneInfo(TZ_NAME)
+                tzinfo=_TZ
             ).astimezone(dt.timezone.utc)
             if mts.astimezone(dt.timezone.utc) > cutoff_utc:
                 return True
@@ -1257,7 +1634,6 @@ async def poll_resolver(request: Request, limit: int = 200):
         ORDER BY due_ts ASC
         LIMIT ?
     """, (limit,)).fetchall()
-    conn.close()
 
     checked = 0
     resolved = 0
@@ -1266,6 +1642,16 @@ async def poll_resolver(request: Request, limit: int = 200):
     call_resolved = 0
     call_updated_counts = 0
 
+    # Fetch every thread up front (bounded concurrency), then apply all
+    # count/status changes in one transaction at the end, one savepoint per issue.
+    fetched = await ghl_list_messages_many(
+        [r["conversation_id"] for r in rows] + [r["conversation_id"] for r in call_rows], limit=50
+    )
+    # Per-issue writes: (issue_id, conversation_id, issue_type,
+    # (conversation_id, ts_iso, contact_id) row for conversation_state or None,
+    # new outbound_count or None, resolve?)
+    plans: List[Tuple[int, str, str, Optional[Tuple[str, str, Optional[str]]], Optional[int], bool]] = []
+
     for r in rows:
         checked += 1
         issue_id = r["id"]
@@ -1273,80 +1659,51 @@ async def poll_resolver(request: Request, limit: int = 200):
         if not conv_id:
             continue
 
-        try:
-            msgs = await ghl_list_messages(conv_id, limit=50)
-        except HTTPException:
+        msgs = fetched.get(conv_id)
+        if msgs is None:
             continue
 
+        # Cutoff converted once per issue; each message timestamp is parsed once.
+        fi_utc: Optional[dt.datetime] = None
         try:
             fi = dt.datetime.fromisoformat((r["first_inbound_ts"] or "").replace("Z", "+00:00"))
+            fi_utc = fi.astimezone(dt.timezone.utc) if fi.tzinfo else fi.replace(tzinfo=_TZ).astimezone(dt.timezone.utc)
         except Exception:
-            fi = None
+            fi_utc = None
 
         outbound_after = False
         out_count = 0
         latest_staff_ts: Optional[dt.datetime] = None
         latest_staff_uid: Optional[str] = None
-        latest_customer_inbound_ts: Optional[dt.datetime] = None
-        latest_customer_inbound_text: str = ""
 
         for m in msgs:
-            if _msg_is_staff_outbound(m):
-                out_count += 1
-
-                mts0 = _msg_ts(m)
-                if mts0 is not None:
-                    if latest_staff_ts is None or mts0 > latest_staff_ts:
-                        latest_staff_ts = mts0
-                        latest_staff_uid = str(m.get("userId") or "")
-
-                if fi is not None:
-                    mts = _msg_ts(m)
-                    if mts is None:
-                        continue
-                    try:
-                        # compare as UTC
-                        fi_utc = fi.astimezone(dt.timezone.utc) if fi.tzinfo else fi.replace(tzinfo=ZoneInfo(TZ_NAME)).astimezone(dt.timezone.utc)
-                        if mts.astimezone(dt.timezone.utc) > fi_utc:
-                            outbound_after = True
-                    except Exception:
-                        pass
+            if not _msg_is_staff_outbound(m):
+                continue
+            out_count += 1
+            mts = _msg_ts(m)
+            if mts is None:
+                continue
+            if latest_staff_ts is None or mts > latest_staff_ts:
+                latest_staff_ts = mts
+                latest_staff_uid = str(m.get("userId") or "")
+            if fi_utc is not None and not outbound_after:
+                try:
+                    # aware datetimes compare by instant; naive ones go through local time as before
+                    if (mts if mts.tzinfo else mts.astimezone(dt.timezone.utc)) > fi_utc:
+                        outbound_after = True
+                except Exception:
+                    pass
 
+        internal_row = None
         if latest_staff_ts is not None:
-            try:
-                set_last_internal_outbound(
-                    conv_id,
-                    latest_staff_ts.astimezone(ZoneInfo(TZ_NAME)).isoformat(),
-                    latest_staff_uid or None,
-                )
-            except Exception:
-                pass
+            internal_row = (conv_id, latest_staff_ts.astimezone(_TZ).isoformat(), latest_staff_uid or None)
 
-        conn2 = db()
         prev_out = r["outbound_count"] if r["outbound_count"] is not None else 0
-        if out_count != prev_out:
-            conn2.execute("UPDATE issues SET outbound_count=? WHERE id=?", (out_count, issue_id))
-            conn2.commit()
-            updated_counts += 1
+        new_count = out_count if out_count != prev_out else None
 
-        if outbound_after:
-            now = _now_local().isoformat()
-            conn2.execute("""
-                UPDATE issues
-                SET status='RESOLVED', resolved_ts=?
-                WHERE id=? AND status IN ('OPEN','PENDING')
-            """, (now, issue_id))
-            conn2.commit()
-            resolved += 1
-            _set_resolved_metadata(issue_id, "RULE_POLL_RESOLVER_SMS_OUTBOUND")
-            _flow_log(
-                "sms.auto_resolved",
-                issue_id=issue_id,
-                conversation_id=conv_id,
-                via="poll_resolver",
-            )
+        if internal_row or new_count is not None or outbound_after:
+            plans.append((issue_id, conv_id, "SMS", internal_row, new_count, outbound_after))
 
-        conn2.close()
 
     for r in call_rows:
         call_checked += 1
@@ -1355,9 +1712,8 @@ async def poll_resolver(request: Request, limit: int = 200):
         if not conv_id:
             continue
 
-        try:
-            msgs = await ghl_list_messages(conv_id, limit=50)
-        except HTTPException:
+        msgs = fetched.get(conv_id)
+        if msgs is None:
             continue
 
         created = _parse_iso_dt(r["created_ts"])
@@ -1366,7 +1722,7 @@ async def poll_resolver(request: Request, limit: int = 200):
         if created is not None:
             try:
                 created_utc = created.astimezone(dt.timezone.utc) if created.tzinfo else created.replace(
-                    tzinfo=ZoneInfo(TZ_NAME)
+                    tzinfo=_TZ
                 ).astimezone(dt.timezone.utc)
                 cutoff_utc = created_utc - dt.timedelta(minutes=max(0.0, CALL_RESOLVE_LOOKBACK_MINUTES))
             except Exception:
@@ -1379,59 +1735,87 @@ async def poll_resolver(request: Request, limit: int = 200):
         latest_staff_uid: Optional[str] = None
 
         for m in msgs:
-            if _msg_is_call_resolution_outbound(m):
-                out_count += 1
-                mts0 = _msg_ts(m)
-                if mts0 is not None:
-                    if latest_staff_ts is None or mts0 > latest_staff_ts:
-                        latest_staff_ts = mts0
-                        latest_staff_uid = str(m.get("userId") or "")
-                if cutoff_utc is None:
-                    continue
-                mts = _msg_ts(m)
-                if mts is None:
-                    continue
+            if not _msg_is_call_resolution_outbound(m):
+                continue
+            out_count += 1
+            mts = _msg_ts(m)
+            if mts is None:
+                continue
+            if latest_staff_ts is None or mts > latest_staff_ts:
+                latest_staff_ts = mts
+                latest_staff_uid = str(m.get("userId") or "")
+            if cutoff_utc is not None and not outbound_after:
                 try:
-                    if mts.astimezone(dt.timezone.utc) > cutoff_utc:
+                    if (mts if mts.tzinfo else mts.astimezone(dt.timezone.utc)) > cutoff_utc:
                         outbound_after = True
                 except Exception:
                     pass
 
+        internal_row = None
         if latest_staff_ts is not None:
-            try:
-                set_last_internal_outbound(
-                    conv_id,
-                    latest_staff_ts.astimezone(ZoneInfo(TZ_NAME)).isoformat(),
-                    latest_staff_uid or None,
-                )
-            except Exception:
-                pass
+            internal_row = (conv_id, latest_staff_ts.astimezone(_TZ).isoformat(), latest_staff_uid or None)
 
-        conn2 = db()
         prev_out = r["outbound_count"] if r["outbound_count"] is not None else 0
-        if out_count != prev_out:
-            conn2.execute("UPDATE issues SET outbound_count=? WHERE id=?", (out_count, issue_id))
-            conn2.commit()
-            call_updated_counts += 1
-
-        if outbound_after:
-            now = _now_local().isoformat()
-            conn2.execute("""
-                UPDATE issues
-                SET status='RESOLVED', resolved_ts=?
-                WHERE id=? AND status='OPEN'
-            """, (now, issue_id))
-            conn2.commit()
-            call_resolved += 1
-            _set_resolved_metadata(issue_id, "RULE_POLL_RESOLVER_CALL_OUTBOUND")
-            _flow_log(
-                "call.auto_resolved",
-                issue_id=issue_id,
-                conversation_id=conv_id,
-                via="poll_resolver",
-            )
+        new_count = out_count if out_count != prev_out else None
+
+        if internal_row or new_count is not None or outbound_after:
+            plans.append((issue_id, conv_id, "CALL", internal_row, new_count, outbound_after))
+
+    sms_resolved: List[Tuple[int, str]] = []
+    call_resolved_ids: List[Tuple[int, str]] = []
+    if plans:
+        now = _now_iso()
+        with conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            for issue_id, conv_id, issue_type, internal_row, new_count, resolve in plans:
+                # A failing issue rolls back only its own writes; the rest of the batch still commits.
+                conn.execute("SAVEPOINT poll_issue")
+                try:
+                    if internal_row is not None:
+                        conn.execute(_LAST_INTERNAL_OUTBOUND_UPSERT, internal_row)
+                    if new_count is not None:
+                        conn.execute("UPDATE issues SET outbound_count=? WHERE id=?", (new_count, issue_id))
+                    if resolve and issue_type == "SMS":
+                        conn.execute("""
+                            UPDATE issues
+                            SET status='RESOLVED', resolved_ts=?
+                            WHERE id=? AND status IN ('OPEN','PENDING')
+                        """, (now, issue_id))
+                        _set_resolved_metadata(issue_id, "RULE_POLL_RESOLVER_SMS_OUTBOUND", commit=False)
+                    elif resolve:
+                        conn.execute("""
+                            UPDATE issues
+                            SET status='RESOLVED', resolved_ts=?
+                            WHERE id=? AND status='OPEN'
+                        """, (now, issue_id))
+                        _set_resolved_metadata(issue_id, "RULE_POLL_RESOLVER_CALL_OUTBOUND", commit=False)
+                    conn.execute("RELEASE poll_issue")
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO poll_issue")
+                    conn.execute("RELEASE poll_issue")
+                    _flow_log("poll_resolver.issue_write_failed", issue_id=issue_id, error=str(e))
+                    continue
 
-        conn2.close()
+                if issue_type == "SMS":
+                    if new_count is not None:
+                        updated_counts += 1
+                    if resolve:
+                        sms_resolved.append((issue_id, conv_id))
+                else:
+                    if new_count is not None:
+                        call_updated_counts += 1
+                    if resolve:
+                        call_resolved_ids.append((issue_id, conv_id))
+        resolved = len(sms_resolved)
+        call_resolved = len(call_resolved_ids)
+        if sms_resolved or call_resolved_ids:
+            _invalidate_open_count()
+
+    for iid, conv_id in sms_resolved:
+        _flow_log("sms.auto_resolved", issue_id=iid, conversation_id=conv_id, via="poll_resolver")
+    for iid, conv_id in call_resolved_ids:
+        _flow_log("call.auto_resolved", issue_id=iid, conversation_id=conv_id, via="poll_resolver")
 
     return {
         "job": "poll_resolver",
@@ -1479,36 +1863,34 @@ def _ai_gate_db_get(conversation_id: str) -> Optional[sqlite3.Row]:
         "SELECT * FROM conversation_ai_gate WHERE conversation_id=?",
         (conversation_id,),
     ).fetchone()
-    conn.close()
     return row
 
 def _ai_gate_db_put(conversation_id: str, last_msg_ts: str, result: Dict[str, Any]) -> None:
     conn = db()
-    conn.execute(
-        '''
-        INSERT INTO conversation_ai_gate
-          (conversation_id, last_msg_ts, needs_follow_up, confidence, evidence_json, model, created_ts)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(conversation_id) DO UPDATE SET
-          last_msg_ts=excluded.last_msg_ts,
-          needs_follow_up=excluded.needs_follow_up,
-          confidence=excluded.confidence,
-          evidence_json=excluded.evidence_json,
-          model=excluded.model,
-          created_ts=excluded.created_ts
-        ''',
-        (
-            conversation_id,
-            last_msg_ts,
-            str(result.get("needs_follow_up") or "YES"),
-            float(result.get("confidence") or 0.0),
-            json.dumps(result.get("evidence") or []),
-            AI_GATE_MODEL,
-            _now_local().isoformat(),
-        ),
-    )
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            '''
+            INSERT INTO conversation_ai_gate
+              (conversation_id, last_msg_ts, needs_follow_up, confidence, evidence_json, model, created_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(conversation_id) DO UPDATE SET
+              last_msg_ts=excluded.last_msg_ts,
+              needs_follow_up=excluded.needs_follow_up,
+              confidence=excluded.confidence,
+              evidence_json=excluded.evidence_json,
+              model=excluded.model,
+              created_ts=excluded.created_ts
+            ''',
+            (
+                conversation_id,
+                last_msg_ts,
+                str(result.get("needs_follow_up") or "YES"),
+                float(result.get("confidence") or 0.0),
+                orjson.dumps(result.get("evidence") or []).decode(),
+                AI_GATE_MODEL,
+                _now_iso(),
+            ),
+        )
 
 def _select_context_window(msgs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     '''
@@ -1557,15 +1939,19 @@ def _select_context_window(msgs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     selected.reverse()
     return [m for _, m in selected]
 
+_PII_EMAIL_RE = re.compile(r"\b[\w.\-+%]+@[\w.\-]+\.[A-Za-z]{2,}\b")
+_PII_URL_RE = re.compile(r"https?://\S+")
+# lenient phone-like matcher (supports +1, spaces, dashes, parens)
+_PII_PHONE_RE = re.compile(r"\+?\d[\d\-\(\) ]{7,}\d")
+
 def _build_ai_transcript(window: List[Dict[str, Any]]) -> str:
     def _redact_pii(s: str) -> str:
         t = s or ""
         if not AI_GATE_REDACT_PII:
             return t
-        t = re.sub(r"\b[\w.\-+%]+@[\w.\-]+\.[A-Za-z]{2,}\b", "[EMAIL]", t)
-        t = re.sub(r"https?://\S+", "[URL]", t)
-        # lenient phone-like matcher (supports +1, spaces, dashes, parens)
-        t = re.sub(r"\+?\d[\d\-\(\) ]{7,}\d", "[PHONE]", t)
+        t = _PII_EMAIL_RE.sub("[EMAIL]", t)
+        t = _PII_URL_RE.sub("[URL]", t)
+        t = _PII_PHONE_RE.sub("[PHONE]", t)
         return t
 
     lines: List[str] = []
@@ -1607,7 +1993,7 @@ async def ai_gate_classify(conversation_id: str, msgs: List[Dict[str, Any]]) ->
             return {
                 "needs_follow_up": str(cached["needs_follow_up"]),
                 "confidence": float(cached["confidence"]),
-                "evidence": json.loads(cached["evidence_json"] or "[]"),
+                "evidence": orjson.loads(cached["evidence_json"] or "[]"),
                 "cached": True,
             }
         except Exception:
@@ -1648,11 +2034,10 @@ async def ai_gate_classify(conversation_id: str, msgs: List[Dict[str, Any]]) ->
     }
 
     try:
-        async with httpx.AsyncClient(timeout=AI_GATE_TIMEOUT_SECONDS) as client:
-            r = await client.post(f"{OPENAI_BASE_URL}/responses", headers=_ai_headers(), json=payload)
-            if r.status_code >= 400:
-                return {"needs_follow_up": "YES", "confidence": 0.0, "evidence": [f"ai error {r.status_code}"]}
-            data = r.json()
+        r = await _ai_http().post(f"{OPENAI_BASE_URL}/responses", headers=_ai_headers(), content=orjson.dumps(payload))
+        if r.status_code >= 400:
+            return {"needs_follow_up": "YES", "confidence": 0.0, "evidence": [f"ai error {r.status_code}"]}
+        data = orjson.loads(r.content)
 
         if str(data.get("status") or "").lower() == "incomplete":
             reason = (
@@ -1677,7 +2062,7 @@ async def ai_gate_classify(conversation_id: str, msgs: List[Dict[str, Any]]) ->
         if not txt:
             return {"needs_follow_up": "YES", "confidence": 0.0, "evidence": ["ai empty response"]}
 
-        result = json.loads(txt)
+        result = orjson.loads(txt)
         nf = str(result.get("needs_follow_up") or "YES").upper()
         if nf not in ("YES", "NO"):
             nf = "YES"
@@ -1762,7 +2147,6 @@ async def verify_pending(request: Request, limit: int = 200):
         ORDER BY due_ts ASC
         LIMIT ?
     """, (now_iso, limit)).fetchall()
-    conn.close()
 
     checked = 0
     promoted = 0
@@ -1793,13 +2177,13 @@ async def verify_pending(request: Request, limit: int = 200):
 
         if not conv_id:
             conn2 = db()
-            conn2.execute("""
-                UPDATE issues
-                SET status='OPEN'
-                WHERE id=? AND status='PENDING'
-            """, (issue_id,))
-            conn2.commit()
-            conn2.close()
+            with conn2:
+                conn2.execute("""
+                    UPDATE issues
+                    SET status='OPEN'
+                    WHERE id=? AND status='PENDING'
+                """, (issue_id,))
+            _invalidate_open_count()
             promoted += 1
             _flow_log(
                 "sms.promoted_open",
@@ -1843,7 +2227,7 @@ async def verify_pending(request: Request, limit: int = 200):
                     if mts is None:
                         continue
                     try:
-                        fi_utc = fi.astimezone(dt.timezone.utc) if fi.tzinfo else fi.replace(tzinfo=ZoneInfo(TZ_NAME)).astimezone(dt.timezone.utc)
+                        fi_utc = fi.astimezone(dt.timezone.utc) if fi.tzinfo else fi.replace(tzinfo=_TZ).astimezone(dt.timezone.utc)
                         if mts.astimezone(dt.timezone.utc) > fi_utc:
                             outbound_after = True
                     except Exception:
@@ -1867,8 +2251,8 @@ async def verify_pending(request: Request, limit: int = 200):
             and _is_ack_closeout(latest_customer_inbound_text)
         ):
             try:
-                staff_local = latest_staff_ts.astimezone(ZoneInfo(TZ_NAME))
-                inbound_local = latest_customer_inbound_ts.astimezone(ZoneInfo(TZ_NAME))
+                staff_local = latest_staff_ts.astimezone(_TZ)
+                inbound_local = latest_customer_inbound_ts.astimezone(_TZ)
                 if ACK_CLOSE_WINDOW_MODE == "eod":
                     window_end = _business_day_end_for(staff_local)
                     ack_closeout_after_staff = (inbound_local >= staff_local) and (inbound_local <= window_end)
@@ -1911,22 +2295,22 @@ async def verify_pending(request: Request, limit: int = 200):
                 pass
         conn2 = db()
         if conv_id != r["conversation_id"]:
-            conn2.execute("UPDATE issues SET conversation_id=? WHERE id=?", (conv_id, issue_id))
-            conn2.commit()
+            with conn2:
+                conn2.execute("UPDATE issues SET conversation_id=? WHERE id=?", (conv_id, issue_id))
 
         prev_out = r["outbound_count"] if r["outbound_count"] is not None else 0
         if out_count != prev_out:
-            conn2.execute("UPDATE issues SET outbound_count=? WHERE id=?", (out_count, issue_id))
-            conn2.commit()
+            with conn2:
+                conn2.execute("UPDATE issues SET outbound_count=? WHERE id=?", (out_count, issue_id))
             updated_counts += 1
 
         if outbound_after or ack_closeout_after_staff or ai_suppress:
-            conn2.execute("""
-                UPDATE issues
-                SET status='RESOLVED', resolved_ts=?
-                WHERE id=? AND status='PENDING'
-            """, (now_iso, issue_id))
-            conn2.commit()
+            with conn2:
+                conn2.execute("""
+                    UPDATE issues
+                    SET status='RESOLVED', resolved_ts=?
+                    WHERE id=? AND status='PENDING'
+                """, (now_iso, issue_id))
             auto_resolved += 1
             resolved_by = (
                 "AI_PRIMARY"
@@ -1958,15 +2342,15 @@ async def verify_pending(request: Request, limit: int = 200):
                 conversation_id=conv_id,
                 via=("verify_pending_ai_gate" if ai_suppress else ("verify_pending_ack_closeout" if ack_closeout_after_staff else "verify_pending")),
             )
-            conn2.close()
             continue
 
-        conn2.execute("""
-            UPDATE issues
-            SET status='OPEN'
-            WHERE id=? AND status='PENDING'
-        """, (issue_id,))
-        conn2.commit()
+        with conn2:
+            conn2.execute("""
+                UPDATE issues
+                SET status='OPEN'
+                WHERE id=? AND status='PENDING'
+            """, (issue_id,))
+        _invalidate_open_count()
         promoted += 1
         _flow_log(
             "sms.promoted_open",
@@ -1974,7 +2358,6 @@ async def verify_pending(request: Request, limit: int = 200):
             conversation_id=conv_id,
             via="verify_pending",
         )
-        conn2.close()
 
     for r in call_rows:
         call_checked += 1
@@ -2003,7 +2386,7 @@ async def verify_pending(request: Request, limit: int = 200):
         if created is not None:
             try:
                 created_utc = created.astimezone(dt.timezone.utc) if created.tzinfo else created.replace(
-                    tzinfo=ZoneInfo(TZ_NAME)
+                    tzinfo=_TZ
                 ).astimezone(dt.timezone.utc)
                 cutoff_utc = created_utc - dt.timedelta(minutes=max(0.0, CALL_RESOLVE_LOOKBACK_MINUTES))
             except Exception:
@@ -2016,20 +2399,18 @@ async def verify_pending(request: Request, limit: int = 200):
         latest_staff_uid: Optional[str] = None
 
         for m in msgs:
-            if _msg_is_call_resolution_outbound(m):
-                out_count += 1
-                mts0 = _msg_ts(m)
-                if mts0 is not None:
-                    if latest_staff_ts is None or mts0 > latest_staff_ts:
-                        latest_staff_ts = mts0
-                        latest_staff_uid = str(m.get("userId") or "")
-                if cutoff_utc is None:
-                    continue
-                mts = _msg_ts(m)
-                if mts is None:
-                    continue
+            if not _msg_is_call_resolution_outbound(m):
+                continue
+            out_count += 1
+            mts = _msg_ts(m)
+            if mts is None:
+                continue
+            if latest_staff_ts is None or mts > latest_staff_ts:
+                latest_staff_ts = mts
+                latest_staff_uid = str(m.get("userId") or "")
+            if cutoff_utc is not None and not outbound_after:
                 try:
-                    if mts.astimezone(dt.timezone.utc) > cutoff_utc:
+                    if (mts if mts.tzinfo else mts.astimezone(dt.timezone.utc)) > cutoff_utc:
                         outbound_after = True
                 except Exception:
                     pass
@@ -2038,7 +2419,7 @@ async def verify_pending(request: Request, limit: int = 200):
             try:
                 set_last_internal_outbound(
                     conv_id,
-                    latest_staff_ts.astimezone(ZoneInfo(TZ_NAME)).isoformat(),
+                    latest_staff_ts.astimezone(_TZ).isoformat(),
                     latest_staff_uid or None,
                 )
             except Exception:
@@ -2046,22 +2427,22 @@ async def verify_pending(request: Request, limit: int = 200):
 
         conn2 = db()
         if conv_id and conv_id != r["conversation_id"]:
-            conn2.execute("UPDATE issues SET conversation_id=? WHERE id=?", (conv_id, issue_id))
-            conn2.commit()
+            with conn2:
+                conn2.execute("UPDATE issues SET conversation_id=? WHERE id=?", (conv_id, issue_id))
 
         prev_out = r["outbound_count"] if r["outbound_count"] is not None else 0
         if out_count != prev_out:
-            conn2.execute("UPDATE issues SET outbound_count=? WHERE id=?", (out_count, issue_id))
-            conn2.commit()
+            with conn2:
+                conn2.execute("UPDATE issues SET outbound_count=? WHERE id=?", (out_count, issue_id))
             call_updated_counts += 1
 
         if outbound_after:
-            conn2.execute("""
-                UPDATE issues
-                SET status='RESOLVED', resolved_ts=?
-                WHERE id=? AND status='PENDING'
-            """, (now_iso, issue_id))
-            conn2.commit()
+            with conn2:
+                conn2.execute("""
+                    UPDATE issues
+                    SET status='RESOLVED', resolved_ts=?
+                    WHERE id=? AND status='PENDING'
+                """, (now_iso, issue_id))
             call_auto_resolved += 1
             _set_resolved_metadata(issue_id, "RULE_VERIFY_PENDING_CALL_OUTBOUND")
             _flow_log(
@@ -2071,15 +2452,15 @@ async def verify_pending(request: Request, limit: int = 200):
                 conversation_id=conv_id,
                 via="verify_pending",
             )
-            conn2.close()
             continue
 
-        conn2.execute("""
-            UPDATE issues
-            SET status='OPEN'
-            WHERE id=? AND status='PENDING'
-        """, (issue_id,))
-        conn2.commit()
+        with conn2:
+            conn2.execute("""
+                UPDATE issues
+                SET status='OPEN'
+                WHERE id=? AND status='PENDING'
+            """, (issue_id,))
+        _invalidate_open_count()
         call_promoted += 1
         _flow_log(
             "call.promoted_open",
@@ -2088,7 +2469,6 @@ async def verify_pending(request: Request, limit: int = 200):
             conversation_id=conv_id,
             via="verify_pending",
         )
-        conn2.close()
 
     return {
         "job": "verify_pending",
@@ -2134,14 +2514,21 @@ async def cleanup_raw_events(request: Request, days: Optional[int] = None, sourc
 # ==========================
 # Summary logic (Managers only, v1)
 # ==========================
+_NON_DIGIT_RE = re.compile(r"\D")
+# str.translate skips the regex engine; only valid for ASCII input (\D is Unicode-aware)
+_ASCII_NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(128) if not chr(c).isdigit()))
+
 def _short_phone(p: Optional[str]) -> str:
     if not p:
         return "-"
-    s = re.sub(r"\D", "", p)
+    s = p.translate(_ASCII_NON_DIGITS) if p.isascii() else _NON_DIGIT_RE.sub("", p)
     if len(s) >= 10:
         return f"+1***{s[-4:]}"
     return p
 
+# Summary rows parse the same timestamps several times (last/due/escalation);
+# results are immutable datetimes, so both helpers memoize on the raw string.
+@lru_cache(maxsize=4096)
 def _parse_iso(ts: Optional[str]) -> Optional[dt.datetime]:
     if not ts:
         return None
@@ -2158,8 +2545,8 @@ def _is_recent(ts: Optional[str], now_local: dt.datetime, window_minutes: int) -
         return False
     try:
         if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=ZoneInfo(TZ_NAME))
-        delta = now_local - parsed.astimezone(ZoneInfo(TZ_NAME))
+            parsed = parsed.replace(tzinfo=_TZ)
+        delta = now_local - parsed.astimezone(_TZ)
         return 0 <= delta.total_seconds() <= (max(0, window_minutes) * 60.0)
     except Exception:
         return False
@@ -2170,17 +2557,56 @@ def _is_escalated(issue_type: str, first_inbound_ts: Optional[str], created_ts:
     Uses business-hours adder from first_inbound_ts (SMS) or created_ts (CALL).
     """
     base_ts = first_inbound_ts if issue_type == "SMS" and first_inbound_ts else created_ts
+    threshold = _escalation_threshold(base_ts)
+    if threshold is None:
+        return False
+    return now_local >= threshold
+
+@lru_cache(maxsize=1024)
+def _escalation_threshold(base_ts: Optional[str]) -> Optional[dt.datetime]:
+    """base_ts + 24 business hours; rows are re-checked every summary/alert run."""
     base = _parse_iso(base_ts)
     if not base:
-        return False
+        return None
     if base.tzinfo is None:
-        base = base.replace(tzinfo=ZoneInfo(TZ_NAME))
-    threshold = add_business_hours(base.astimezone(ZoneInfo(TZ_NAME)), 24.0)
-    return now_local >= threshold
+        base = base.replace(tzinfo=_TZ)
+    return add_business_hours(base.astimezone(_TZ), 24.0)
+
+# Manager contact_id -> (expires_monotonic, conversation_id). The mapping is nearly
+# static, so summaries/alerts/command replies skip the search for an hour.
+MANAGER_CONVERSATION_CACHE_TTL_SECONDS = 3600.0
+_manager_conversation_cache: Dict[str, Tuple[float, str]] = {}
 
 async def _manager_conversation_for_contact(contact_id: str) -> Optional[str]:
+    now = time.monotonic()
+    hit = _manager_conversation_cache.get(contact_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
     # lookup via conversations/search?contactId=...
-    return await ghl_find_conversation_id_for_contact(contact_id, None)
+    conv_id = await ghl_find_conversation_id_for_contact(contact_id, None)
+    if conv_id:
+        _manager_conversation_cache[contact_id] = (now + MANAGER_CONVERSATION_CACHE_TTL_SECONDS, conv_id)
+    return conv_id
+
+async def _send_to_managers(body: str) -> Tuple[List[str], List[str]]:
+    """
+    Delivers body to every manager concurrently.
+    Returns (sent_to, errors), both in MANAGER_CONTACT_IDS_ORDERED order.
+    """
+    async def _deliver(mgr_contact_id: str) -> Optional[str]:
+        try:
+            conv_id = await _manager_conversation_for_contact(mgr_contact_id)
+            if not conv_id:
+                return f"manager contact {mgr_contact_id}: no conversation found"
+            await ghl_send_message(conv_id, mgr_contact_id, body)
+        except Exception as e:
+            return f"manager contact {mgr_contact_id}: {type(e).__name__}"
+        return None
+
+    outcomes = await asyncio.gather(*[_deliver(m) for m in MANAGER_CONTACT_IDS_ORDERED])
+    sent_to = [m for m, err in zip(MANAGER_CONTACT_IDS_ORDERED, outcomes) if err is None]
+    errors = [err for err in outcomes if err is not None]
+    return sent_to, errors
 
 
 register_sms_routes(
@@ -2213,13 +2639,16 @@ register_sms_routes(
         db=db,
         ghl_get_contact_name=ghl_get_contact_name,
         list_open_issues=list_open_issues,
-        set_issue_contact_name=_set_issue_contact_name,
+        set_issue_contact_names=_set_issue_contact_names,
         render_list_like_summary=_render_list_like_summary,
         get_issue_by_id=get_issue_by_id,
         add_note=add_note,
         resolve_by_id=resolve_by_id,
+        resolve_by_ids=resolve_by_ids,
+        get_issue_phones=get_issue_phones,
         resolve_target=resolve_target,
         mark_spam=mark_spam,
+        mark_spam_many=mark_spam_many,
         resolve_by_phone=resolve_by_phone,
         ghl_conversation_link=ghl_conversation_link,
     ),
@@ -2235,16 +2664,19 @@ def _summary_title(slot: str) -> str:
         return "Afternoon"
     return slot.capitalize()
 
+@lru_cache(maxsize=4096)
 def _fmt_dt_local(ts: Optional[str]) -> str:
     d = _parse_iso(ts)
     if not d:
         return "-"
     if d.tzinfo is None:
-        d = d.replace(tzinfo=ZoneInfo(TZ_NAME))
-    loc = d.astimezone(ZoneInfo(TZ_NAME))
-    return loc.strftime("%-I:%M%p").lower()
+        d = d.replace(tzinfo=_TZ)
+    loc = d.astimezone(_TZ)
+    return _fmt_clock(loc)
 
-def _build_section_lines(rows: List[sqlite3.Row], label: str, now_local: dt.datetime) -> Tuple[List[str], List[str]]:
+def _build_section_lines(
+    rows: List[sqlite3.Row], label: str, now_local: dt.datetime, names: Optional[Dict[int, str]] = None
+) -> Tuple[List[str], List[str]]:
     """
     Returns (normal_lines, escalated_lines)
     """
@@ -2253,7 +2685,7 @@ def _build_section_lines(rows: List[sqlite3.Row], label: str, now_local: dt.date
 
     for r in rows[:SUMMARY_MAX_ITEMS_PER_SECTION]:
         it = r["issue_type"]
-        who = _display_name(r)
+        who = _display_name(r, names)
         last_in = r["last_inbound_ts"] or r["created_ts"]
         due = r["due_ts"]
         inc = r["inbound_count"] if r["inbound_count"] is not None else 0
@@ -2270,49 +2702,71 @@ def _build_section_lines(rows: List[sqlite3.Row], label: str, now_local: dt.date
         return [f"{header}: none"], []
     return [header + ":"] + normal, escalated
 
-def _display_name(r: sqlite3.Row) -> str:
+def _display_name(r: sqlite3.Row, names: Optional[Dict[int, str]] = None) -> str:
+    """names: issue id -> contact name fetched after r was read (see _enrich_issues_with_contact_names)."""
+    if names:
+        fetched = names.get(r["id"])
+        if fetched:
+            return fetched
+    name = (r["contact_name"] or "").strip()
+    if name:
+        return name
+    # Legacy rows may only carry the name inside meta.
     try:
-        meta = json.loads(r["meta"] or "{}")
+        meta = orjson.loads(r["meta"] or "{}")
     except Exception:
         meta = {}
     name = (meta.get("contact_name") or "").strip()
     return name if name else _short_phone(r["phone"])
 
-async def _enrich_issues_with_contact_names(issues: List[sqlite3.Row]) -> None:
+async def _enrich_issues_with_contact_names(issues: List[sqlite3.Row]) -> Dict[int, str]:
     """
-    For issues missing contact_name in meta, fetch from GHL API and update DB.
+    For issues missing a contact name (column and meta), fetch from GHL API and update DB.
+    Returns issue id -> fetched name so callers can render without re-querying.
     """
+    found: Dict[int, str] = {}
     conn = db()
+    pending: List[Tuple[sqlite3.Row, Dict[str, Any]]] = []
     for issue in issues:
+        # Skip if contact_name already exists (column first; avoids the meta parse)
+        if (issue["contact_name"] or "").strip():
+            continue
         try:
-            meta = json.loads(issue["meta"] or "{}")
+            meta = orjson.loads(issue["meta"] or "{}")
         except Exception:
             meta = {}
-        
-        # Skip if contact_name already exists
         if (meta.get("contact_name") or "").strip():
             continue
         
         # Skip if no contact_id to look up
-        contact_id = issue["contact_id"]
-        if not contact_id:
+        if not issue["contact_id"]:
             continue
-        
-        # Fetch contact name from GHL API
-        try:
-            contact_name = await ghl_get_contact_name(contact_id)
-            if contact_name:
-                meta["contact_name"] = contact_name
-                conn.execute(
-                    "UPDATE issues SET meta=? WHERE id=?",
-                    (json.dumps(meta), issue["id"])
-                )
-                conn.commit()
-        except Exception:
-            pass
-    
-    conn.close()
-
+        pending.append((issue, meta))
+
+    # Fetch each distinct contact once, concurrently, then write all names in one transaction
+    contact_ids = list(dict.fromkeys(issue["contact_id"] for issue, _ in pending))
+    by_contact = dict(zip(contact_ids, await ghl_get_contact_names(contact_ids)))
+    updates: List[Tuple[str, str, int]] = []
+    for issue, meta in pending:
+        contact_name = by_contact.get(issue["contact_id"])
+        if contact_name:
+            meta["contact_name"] = contact_name
+            updates.append((contact_name, orjson.dumps(meta).decode(), issue["id"]))
+            found[issue["id"]] = contact_name
+    if updates:
+        with conn:
+            conn.executemany("UPDATE issues SET contact_name=?, meta=? WHERE id=?", updates)
+    return found
+
+
+# Strong refs for fire-and-forget tasks (the loop only keeps weak ones).
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+def _forget_background_task(task: "asyncio.Task[Any]") -> None:
+    _background_tasks.discard(task)
+    e = None if task.cancelled() else task.exception()
+    if e is not None:
+        print(f"background task failed: {type(e).__name__}: {e}")
 
 @app.post("/jobs/send_summary")
 async def send_summary(request: Request, slot: str = "morning", dry_run: int = 0):
@@ -2332,68 +2786,38 @@ async def send_summary(request: Request, slot: str = "morning", dry_run: int = 0
     now_local = _now_local()
     now_iso = now_local.isoformat()
 
-    # (Optional) run resolver first so summaries don't include already-answered threads
-    # Keep deterministic, but don't fail summary if resolver has transient API issue.
-    try:
-        await poll_resolver(request, limit=500)
-    except Exception:
-        pass
-
-    conn = db()
-
-    # Overdue = OPEN and now >= due_ts
-    overdue_sms = conn.execute("""
-      SELECT *
-      FROM issues
-      WHERE status='OPEN' AND issue_type='SMS' AND due_ts <= ?
-      ORDER BY due_ts ASC
-    """, (now_iso,)).fetchall()
-
-    overdue_calls = conn.execute("""
-      SELECT *
-      FROM issues
-      WHERE status='OPEN' AND issue_type='CALL' AND due_ts <= ?
-      ORDER BY due_ts ASC
-    """, (now_iso,)).fetchall()
+    # (Optional) run resolver first so summaries don't include already-answered threads.
+    # It overlaps the KV read below and is waited on (bounded) before the issue query;
+    # a slow GHL run keeps going in the background instead of blocking the summary.
+    resolver_task = asyncio.create_task(poll_resolver(request, limit=500))
+    _background_tasks.add(resolver_task)
+    resolver_task.add_done_callback(_forget_background_task)
 
     # Resolved since last summary
     key = "last_summary_ts"
     slot_key = f"last_summary_ts_{slot.lower()}"  # backward-compat fallback
-    last_ts = kv_get(key) or kv_get(slot_key)
-    resolved_since: List[sqlite3.Row] = []
-    if last_ts:
-        resolved_since = conn.execute("""
-          SELECT *
-          FROM issues
-          WHERE status='RESOLVED'
-            AND resolved_ts IS NOT NULL
-            AND resolved_ts > ?
-            AND resolved_ts <= ?
-          ORDER BY resolved_ts DESC
-          LIMIT 100
-        """, (last_ts, now_iso)).fetchall()
-
-    conn.close()
+    last_vals = await kv_get_many_async((key, slot_key))
+    last_ts = last_vals.get(key) or last_vals.get(slot_key)
 
-    # Enrich issues with contact names if missing
-    await _enrich_issues_with_contact_names(list(overdue_sms) + list(overdue_calls) + list(resolved_since))
+    # Don't fail summary if resolver has transient API issue.
+    try:
+        await asyncio.wait_for(asyncio.shield(resolver_task), timeout=SUMMARY_RESOLVER_WAIT_SECONDS)
+    except Exception:
+        pass
 
-    # Re-fetch issues after enrichment to get updated meta data
     conn = db()
-    overdue_sms = conn.execute("""
-      SELECT *
-      FROM issues
-      WHERE status='OPEN' AND issue_type='SMS' AND due_ts <= ?
-      ORDER BY due_ts ASC
-    """, (now_iso,)).fetchall()
 
-    overdue_calls = conn.execute("""
+    # Overdue = OPEN and now >= due_ts (one query, split by type; due_ts order is kept)
+    overdue = conn.execute("""
       SELECT *
       FROM issues
-      WHERE status='OPEN' AND issue_type='CALL' AND due_ts <= ?
+      WHERE status='OPEN' AND issue_type IN ('SMS','CALL') AND due_ts <= ?
       ORDER BY due_ts ASC
     """, (now_iso,)).fetchall()
+    overdue_sms = [r for r in overdue if r["issue_type"] == "SMS"]
+    overdue_calls = [r for r in overdue if r["issue_type"] == "CALL"]
 
+    resolved_since: List[sqlite3.Row] = []
     if last_ts:
         resolved_since = conn.execute("""
           SELECT *
@@ -2406,45 +2830,40 @@ async def send_summary(request: Request, slot: str = "morning", dry_run: int = 0
           LIMIT 100
         """, (last_ts, now_iso)).fetchall()
 
-    conn.close()
 
-    title = _summary_title(slot)
-    lines: List[str] = []
-    lines.append(f"NTPP Sentinel — {title} ({_fmt_date_local(now_local)}) • as of {_fmt_as_of_local(now_local)}")
-    lines.append(f"Overdue: Calls {len(overdue_calls)} | Texts {len(overdue_sms)}")
-    lines.append("")
+    # Enrich issues with contact names if missing; fetched names are rendered directly.
+    names = await _enrich_issues_with_contact_names(overdue_sms + overdue_calls + list(resolved_since))
 
-    # Calls
-    sec_calls, esc_calls = _build_section_lines(overdue_calls, "Calls", now_local)
-    lines.extend(sec_calls)
-
-    # SMS
-    sec_sms, esc_sms = _build_section_lines(overdue_sms, "Texts", now_local)
-    lines.extend(sec_sms)
+    title = _summary_title(slot)
+    sec_calls, esc_calls = _build_section_lines(overdue_calls, "Calls", now_local, names)
+    sec_sms, esc_sms = _build_section_lines(overdue_sms, "Texts", now_local, names)
+
+    # Header, Calls, then SMS sections
+    lines: List[str] = [
+        f"NTPP Sentinel — {title} ({_fmt_date_local(now_local)}) • as of {_fmt_as_of_local(now_local)}",
+        f"Overdue: Calls {len(overdue_calls)} | Texts {len(overdue_sms)}",
+        "",
+        *sec_calls,
+        *sec_sms,
+    ]
 
     # Escalations section (manager-only rollup)
-    escalated_lines = []
     if esc_calls or esc_sms:
-        escalated_lines.append("⚠️ Escalated (24+ business hrs):")
-        escalated_lines.extend(esc_calls[:SUMMARY_MAX_ITEMS_PER_SECTION])
-        escalated_lines.extend(esc_sms[:SUMMARY_MAX_ITEMS_PER_SECTION])
-
-    if escalated_lines:
-        lines.extend(escalated_lines)
+        lines.append("⚠️ Escalated (24+ business hrs):")
+        lines.extend(esc_calls[:SUMMARY_MAX_ITEMS_PER_SECTION])
+        lines.extend(esc_sms[:SUMMARY_MAX_ITEMS_PER_SECTION])
 
     # Dopamine section: show once then disappears
     if last_ts:
         if resolved_since:
             lines.append(f"✅ Resolved since last summary ({len(resolved_since)}):")
             for r in resolved_since[:RESOLVED_SINCE_MAX_ITEMS]:
-                who = _display_name(r)
+                who = _display_name(r, names)
                 rt = _fmt_dt_local(r["resolved_ts"])
                 lines.append(f"#{r['id']} {r['issue_type']} {who} at {rt}")
         else:
             lines.append("✅ Resolved since last summary: none")
-    lines.append("")
-    lines.append("Reply:")
-    lines.append("Open 3 | Resolve 3 5 6 | Spam 7 | Note 3 <text> | List | More")
+    lines.extend(("", "Reply:", "Open 3 | Resolve 3 5 6 | Spam 7 | Note 3 <text> | List | More"))
 
     # keep SMS concise
     body = "\n".join(lines)
@@ -2470,22 +2889,9 @@ async def send_summary(request: Request, slot: str = "morning", dry_run: int = 0
         result["error"] = "MANAGER_CONTACT_IDS not configured"
         return result
 
-    sent_to: List[str] = []
-    errors: List[str] = []
-
-    for mgr_contact_id in MANAGER_CONTACT_IDS:
-        try:
-            conv_id = await _manager_conversation_for_contact(mgr_contact_id)
-            if not conv_id:
-                errors.append(f"manager contact {mgr_contact_id}: no conversation found")
-                continue
-            await ghl_send_message(conv_id, mgr_contact_id, body)
-            sent_to.append(mgr_contact_id)
-        except Exception as e:
-            errors.append(f"manager contact {mgr_contact_id}: {type(e).__name__}")
+    sent_to, errors = await _send_to_managers(body)
 
-    kv_set(key, now_iso)
-    kv_set(slot_key, now_iso)
+    await kv_set_many_async({key: now_iso, slot_key: now_iso})
 
     result["sent"] = True if sent_to else False
     result["sent_to"] = sent_to
@@ -2524,7 +2930,6 @@ async def escalations(request: Request, dry_run: int = 0, limit: int = 200):
       ORDER BY due_ts ASC
       LIMIT ?
     """, (now_iso, limit)).fetchall()
-    conn.close()
     if not rows:
         return {
             "job": "escalations",
@@ -2533,26 +2938,7 @@ async def escalations(request: Request, dry_run: int = 0, limit: int = 200):
             "sent": False,
         }
 
-    await _enrich_issues_with_contact_names(list(rows))
-
-    conn = db()
-    rows = conn.execute("""
-      SELECT *
-      FROM issues
-      WHERE status='OPEN'
-        AND due_ts <= ?
-        AND breach_notified_ts IS NULL
-      ORDER BY due_ts ASC
-      LIMIT ?
-    """, (now_iso, limit)).fetchall()
-    conn.close()
-    if not rows:
-        return {
-            "job": "escalations",
-            "new_breaches": 0,
-            "dry_run": bool(dry_run),
-            "sent": False,
-        }
+    names = await _enrich_issues_with_contact_names(list(rows))
 
     lines: List[str] = []
     lines.append(f"NTPP Sentinel — SLA Breach Alert ({_fmt_date_local(now_local)}) • as of {_fmt_as_of_local(now_local)}")
@@ -2565,13 +2951,13 @@ async def escalations(request: Request, dry_run: int = 0, limit: int = 200):
     if calls:
         lines.append(f"Calls ({len(calls)}):")
         for r in calls[:SUMMARY_MAX_ITEMS_PER_SECTION]:
-            lines.append(f"#{r['id']} {_display_name(r)} — due {_fmt_dt_local(r['due_ts'])}")
+            lines.append(f"#{r['id']} {_display_name(r, names)} — due {_fmt_dt_local(r['due_ts'])}")
 
     if texts:
         lines.append(f"Texts ({len(texts)}):")
         for r in texts[:SUMMARY_MAX_ITEMS_PER_SECTION]:
             inc = r["inbound_count"] if r["inbound_count"] is not None else 0
-            lines.append(f"#{r['id']} {_display_name(r)} — due {_fmt_dt_local(r['due_ts'])} in={inc}")
+            lines.append(f"#{r['id']} {_display_name(r, names)} — due {_fmt_dt_local(r['due_ts'])} in={inc}")
 
     shown = min(len(calls), SUMMARY_MAX_ITEMS_PER_SECTION) + min(len(texts), SUMMARY_MAX_ITEMS_PER_SECTION)
     if len(rows) > shown:
@@ -2596,28 +2982,15 @@ async def escalations(request: Request, dry_run: int = 0, limit: int = 200):
         result["error"] = "MANAGER_CONTACT_IDS not configured"
         return result
 
-    sent_to: List[str] = []
-    errors: List[str] = []
-
-    for mgr_contact_id in MANAGER_CONTACT_IDS:
-        try:
-            conv_id = await _manager_conversation_for_contact(mgr_contact_id)
-            if not conv_id:
-                errors.append(f"manager contact {mgr_contact_id}: no conversation found")
-                continue
-            await ghl_send_message(conv_id, mgr_contact_id, body)
-            sent_to.append(mgr_contact_id)
-        except Exception as e:
-            errors.append(f"manager contact {mgr_contact_id}: {type(e).__name__}")
+    sent_to, errors = await _send_to_managers(body)
 
     # Mark alerted only if at least one manager received the alert.
     if sent_to:
         conn = db()
         ids = [r["id"] for r in rows]
         q = "UPDATE issues SET breach_notified_ts=? WHERE id IN (%s) AND breach_notified_ts IS NULL" % ",".join(["?"] * len(ids))
-        conn.execute(q, [now_iso] + ids)
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute(q, [now_iso] + ids)
         _flow_log("escalations.sent", issue_ids=ids, sent_to_count=len(sent_to))
 
     result["sent"] = True if sent_to else False